@@ -1,3 +1,21 @@
+from .async_flight_concierge_agent import AsyncFlightConciergeAgent
 from .flight_concierge_agent import FlightConciergeAgent
+from .model_tiers import ModelTier, model_tier, streaming_enabled
+from .response_streamer import (
+    AssistantResponseStream,
+    TokenCallback,
+    print_token,
+    streaming_assistant_response,
+)
 
-__all__ = ["FlightConciergeAgent"]
+__all__ = [
+    "AssistantResponseStream",
+    "AsyncFlightConciergeAgent",
+    "FlightConciergeAgent",
+    "ModelTier",
+    "TokenCallback",
+    "model_tier",
+    "print_token",
+    "streaming_assistant_response",
+    "streaming_enabled",
+]
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from pydantic import BaseModel
+
+from flight_concierge.agents.flight_concierge_agent import FlightConciergeAgent
+from flight_concierge.agents.model_tiers import Tier
+from flight_concierge.agents.response_streamer import (
+    TokenCallback,
+    streaming_assistant_response,
+)
+
+
+class AsyncFlightConciergeAgent(FlightConciergeAgent):
+    """Same prompts as `FlightConciergeAgent`, but every method returns a
+    coroutine built on crewai's `kickoff_async` / `acall`, so one event loop
+    can drive many conversations at once. Response cache reads and writes
+    (SQLite) run on worker threads."""
+
+    _instance: "AsyncFlightConciergeAgent | None" = None
+
+    async def _kickoff(
+        self,
+        method: str,
+        prompt: str,
+        response_format: type[BaseModel],
+        tier: Tier = "smart",
+        on_token: TokenCallback | None = None,
+    ):
+        cache_params = self._cache_params(method, prompt, response_format, tier)
+        cached = await asyncio.to_thread(
+            self._cached, cache_params, response_format, on_token
+        )
+        if cached is not None:
+            return cached
+
+        started_at = time.perf_counter()
+        with (
+            self._checkout(tier) as agent,
+            streaming_assistant_response(agent, on_token),
+        ):
+            output = await agent.kickoff_async(
+                prompt.strip(), response_format=response_format
+            )
+        await asyncio.to_thread(self._store, cache_params, output.pydantic, started_at)
+        return output.pydantic
+
+    async def _complete(
+        self,
+        method: str,
+        prompt: str,
+        response_format: type[BaseModel],
+        tier: Tier = "fast",
+    ):
+        cache_params = self._cache_params(method, prompt, response_format, tier)
+        cached = await asyncio.to_thread(self._cached, cache_params, response_format)
+        if cached is not None:
+            return cached
+
+        started_at = time.perf_counter()
+        result = await self._llms[tier].acall(
+            prompt.strip(), response_model=response_format
+        )
+        if not isinstance(result, response_format):
+            result = response_format.model_validate_json(result)
+        await asyncio.to_thread(self._store, cache_params, result, started_at)
+        return result
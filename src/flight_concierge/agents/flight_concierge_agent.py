@@ -1,32 +1,47 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Literal, get_args
 
 from crewai import Agent
-from get_flight_airports_nearby import GetFlightAirportsNearby
+from pydantic import BaseModel
 
+from flight_concierge.agents.model_tiers import Tier, model_tier, streaming_enabled
+from flight_concierge.agents.response_streamer import (
+    TokenCallback,
+    streaming_assistant_response,
+)
+from flight_concierge.services import LLMResponseCache, llm_response_cache_enabled
 from flight_concierge.tools import (
+    GetFlightPriceCalendar,
     GetFlightsFromGoogleFlights,
     QueryLocalAirportsDatabase,
     QueryLocalCitiesDatabase,
     QueryLocalCountriesDatabase,
+    QueryLocalNearbyAirports,
 )
 from flight_concierge.types import (
     ArrivalData,
+    ConversationSummary,
     DepartureData,
     Interaction,
+    LegFlightOptions,
+    TravelDate,
     TripData,
+    TripDataUpdate,
+    TripLegs,
 )
 from flight_concierge.types.message import Message
 
-
-class FlightConciergeAgent:
-    def __init__(self):
-        self._agent = Agent(
-            role="CrewAI Senior Travel Concierge",
-            goal=f"""Find the most convenient flight routes and airport options for traveling FDEs,
+GOAL = """Find the most convenient flight routes and airport options for traveling FDEs,
             considering proximity, accessibility, and travel efficiency in a fluid conversational
             interface that respects the idiom being utilized by the user. You are also always
-            aware of the current date - which is {datetime.now().strftime("%Y-%m-%d")}""".strip(),
-            backstory="""You are a dedicated and professional travel concierge specializing in
+            aware of the current date - which is {today}"""
+
+BACKSTORY = """You are a dedicated and professional travel concierge specializing in
             supporting CrewAI's Field Development Engineers (FDEs) who travel extensively around
             the globe. With years of experience in corporate travel logistics, you excel at
             identifying the most convenient airports, optimal routes, and practical travel options.
@@ -34,31 +49,213 @@ class FlightConciergeAgent:
             connections. Your friendly yet professional approach ensures that every traveler feels
             supported and confident in their journey. You prioritize finding airports that minimize
             travel time and maximize convenience, always keeping the traveler's experience at the
-            forefront of your recommendations.""".strip(),
-            tools=[
-                QueryLocalCountriesDatabase(),
-                QueryLocalCitiesDatabase(),
-                QueryLocalAirportsDatabase(),
-                GetFlightAirportsNearby(),
-                GetFlightsFromGoogleFlights(),
-            ],
-            llm="gpt-4.1",
-        )
+            forefront of your recommendations."""
 
-    def _latest_messages(self, messages: list[Message]):
-        return "\n".join(
-            [f"{msg.role.upper()}: {msg.content}" for msg in messages[-10:]]
+
+# Steps whose answer only depends on the conversation, not on phrasing choices
+CACHED_METHODS = frozenset(
+    {
+        "process_departure_information",
+        "process_arrival_information",
+        "process_trip_legs",
+        "extract_travel_date",
+    }
+)
+
+TRIP_DATA_RETURN = """- metadata: The complete TripData information with all known information filled"""
+
+TRIP_DATA_PATCH_RETURN = """- patch: ONLY the changes to the trip data above, as a list of changes; leave it
+        empty when nothing changes. Each change has:
+            * op: "set" (default) to replace a field, "append" to add a whole leg to "legs",
+              or "remove" to drop a leg (e.g. "legs[1]")
+            * path: where the change goes, e.g. "legs[1].departure.date",
+              "legs[0].arrival.airport" or "legs"
+            * value_json: the new value encoded as JSON, e.g. '"2025-02-11"' (quotes
+              included) or a whole airport / leg object shaped like the trip data above"""
+
+
+class FlightConciergeAgent:
+    """The travel concierge behind every step of the flow.
+
+    Use `shared()` to reuse one instance across steps and flows: the LLM clients
+    and the tools are built once, and each call checks out an idle crewai
+    `Agent` from a small pool so concurrent steps never share one. The current
+    date in the goal is refreshed on every call.
+
+    Each method runs on a model tier (see `model_tier`): short acknowledgements
+    and date extraction on the fast tier, extraction and planning on the smart
+    one, each bounded by its tier's latency budget.
+
+    With `CONCIERGE_STREAMING=true`, the acknowledgement and flight summary
+    methods pass the `assistant_response` text to `on_token` as it is
+    generated; the full `Interaction` is still validated and returned.
+
+    Responses of the `cached_methods` (the extraction steps by default; the
+    conversational ones are not deterministic) are served from
+    `response_cache` when the same prompt was answered by the same model.
+    """
+
+    _instance: "FlightConciergeAgent | None" = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        response_cache: LLMResponseCache | None = None,
+        cached_methods: frozenset[str] = CACHED_METHODS,
+    ):
+        self.response_cache = response_cache
+        self.cached_methods = cached_methods
+        stream = streaming_enabled()
+        self._llms = {
+            tier: model_tier(tier).llm(stream=stream) for tier in get_args(Tier)
+        }
+        self._tools = [
+            QueryLocalCountriesDatabase(),
+            QueryLocalCitiesDatabase(),
+            QueryLocalAirportsDatabase(),
+            QueryLocalNearbyAirports(),
+            GetFlightsFromGoogleFlights(),
+            GetFlightPriceCalendar(),
+        ]
+        self._idle_agents: dict[Tier, list[Agent]] = {tier: [] for tier in self._llms}
+        self._idle_agents_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "FlightConciergeAgent":
+        """Return the process-wide concierge."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(
+                    response_cache=LLMResponseCache.shared()
+                    if llm_response_cache_enabled()
+                    else None
+                )
+            return cls._instance
+
+    @staticmethod
+    def _goal() -> str:
+        return GOAL.format(today=datetime.now().strftime("%Y-%m-%d")).strip()
+
+    def _new_agent(self, tier: Tier) -> Agent:
+        return Agent(
+            role="CrewAI Senior Travel Concierge",
+            goal=self._goal(),
+            backstory=BACKSTORY.strip(),
+            tools=self._tools,
+            llm=self._llms[tier],
         )
 
+    @contextmanager
+    def _checkout(self, tier: Tier) -> Iterator[Agent]:
+        """Borrow an idle agent of the tier, building one only when all are busy."""
+        with self._idle_agents_lock:
+            idle = self._idle_agents[tier]
+            agent = idle.pop() if idle else None
+        if agent is None:
+            agent = self._new_agent(tier)
+        agent.goal = self._goal()
+        try:
+            yield agent
+        finally:
+            with self._idle_agents_lock:
+                self._idle_agents[tier].append(agent)
+
+    def _kickoff(
+        self,
+        method: str,
+        prompt: str,
+        response_format: type[BaseModel],
+        tier: Tier = "smart",
+        on_token: TokenCallback | None = None,
+    ):
+        cache_params = self._cache_params(method, prompt, response_format, tier)
+        cached = self._cached(cache_params, response_format, on_token)
+        if cached is not None:
+            return cached
+
+        started_at = time.perf_counter()
+        with (
+            self._checkout(tier) as agent,
+            streaming_assistant_response(agent, on_token),
+        ):
+            result = agent.kickoff(
+                prompt.strip(), response_format=response_format
+            ).pydantic
+        self._store(cache_params, result, started_at)
+        return result
+
+    def _complete(
+        self,
+        method: str,
+        prompt: str,
+        response_format: type[BaseModel],
+        tier: Tier = "fast",
+    ):
+        """A single LLM call without the agent's tool loop."""
+        cache_params = self._cache_params(method, prompt, response_format, tier)
+        cached = self._cached(cache_params, response_format)
+        if cached is not None:
+            return cached
+
+        started_at = time.perf_counter()
+        result = self._llms[tier].call(prompt.strip(), response_model=response_format)
+        if not isinstance(result, response_format):
+            result = response_format.model_validate_json(result)
+        self._store(cache_params, result, started_at)
+        return result
+
+    def _cache_params(
+        self, method: str, prompt: str, response_format: type[BaseModel], tier: Tier
+    ) -> dict | None:
+        if self.response_cache is None or method not in self.cached_methods:
+            return None
+        return {
+            "method": method,
+            "prompt": " ".join(prompt.split()),
+            "model": self._llms[tier].model,
+            "schema": response_format.model_json_schema(),
+            # Carries the current date, which relative dates are resolved against
+            "goal": self._goal(),
+        }
+
+    def _cached(
+        self,
+        cache_params: dict | None,
+        response_format: type[BaseModel],
+        on_token: TokenCallback | None = None,
+    ):
+        if cache_params is None:
+            return None
+        cached = self.response_cache.get(cache_params)
+        if cached is None:
+            return None
+        result = response_format.model_validate_json(cached)
+        if on_token is not None and isinstance(result, Interaction):
+            on_token(result.assistant_response.content)
+        return result
+
+    def _store(self, cache_params: dict | None, result, started_at: float):
+        if cache_params is not None and result is not None:
+            self.response_cache.put(
+                cache_params,
+                result.model_dump_json(),
+                time.perf_counter() - started_at,
+            )
+
+    def _context_messages(self, messages: list[Message]):
+        return "\n".join([f"{msg.role.upper()}: {msg.content}" for msg in messages])
+
     def _latest_user_message(self, messages: list[Message]):
         return [msg for msg in messages if msg.role == "user"][-1]
 
-    def acknowledge_message(self, messages: list[Message]):
+    def acknowledge_message(
+        self, messages: list[Message], on_token: TokenCallback | None = None
+    ):
         prompt = f"""
         As a Senior Travel Concierge, acknowledge the user's latest message in a warm, professional way.
 
         CONVERSATION HISTORY:
-        {self._latest_messages(messages)}
+        {self._context_messages(messages)}
 
         YOUR TASK:
         - Acknowledge what the user just said
@@ -70,14 +267,16 @@ class FlightConciergeAgent:
         - assistant_response: Your brief acknowledgment message (1-2 sentences max)
         """
 
-        return self._agent.kickoff(prompt.strip(), response_format=Interaction).pydantic
+        return self._kickoff(
+            "acknowledge_message", prompt, Interaction, tier="fast", on_token=on_token
+        )
 
     def process_departure_information(self, messages: list[Message]):
         prompt = f"""
         As a Senior Travel Concierge, focus on extracting and processing DEPARTURE information only.
 
         CONVERSATION HISTORY:
-        {self._latest_messages(messages)}
+        {self._context_messages(messages)}
 
         YOUR TASK: Extract departure details using TOP-DOWN approach:
 
@@ -88,12 +287,14 @@ class FlightConciergeAgent:
         2. DEPARTURE CITY
            - Identify departure city from conversation
            - Use Query Local Cities Database to get: city_code, lat, lng, country_code
+             and its ranked airports
            - Verify country code matches step 1
 
         3. DEPARTURE AIRPORTS
-           - Use Query Local Airports Database with city_code (FREE, try first)
-           - If no results, use Get Flight Airports Nearby with lat/lng (PAID, max once)
-           - Distance: 30 km, ignore heliports and low popularity airports
+           - Use the airports already attached to the city (ranked, within 30 km)
+           - If none are attached, use Query Local Airports Database with city_code
+           - If still no results, use Query Local Nearby Airports with lat/lng (FREE)
+           - Distance: 30 km (heliports and low popularity airports are already filtered out)
 
         4. DEPARTURE DATE
            - Extract departure date from conversation (format: YYYY-MM-DD)
@@ -101,9 +302,7 @@ class FlightConciergeAgent:
         Return only the departure information.
         """
 
-        return self._agent.kickoff(
-            prompt.strip(), response_format=DepartureData
-        ).pydantic
+        return self._kickoff("process_departure_information", prompt, DepartureData)
 
     def process_arrival_information(self, messages: list[Message]):
         """Process arrival location details: country, city, and airports."""
@@ -111,7 +310,7 @@ class FlightConciergeAgent:
         As a Senior Travel Concierge, focus on extracting and processing ARRIVAL information only.
 
         CONVERSATION HISTORY:
-        {self._latest_messages(messages)}
+        {self._context_messages(messages)}
 
         YOUR TASK: Extract arrival details using TOP-DOWN approach:
 
@@ -122,12 +321,14 @@ class FlightConciergeAgent:
         2. ARRIVAL CITY
            - Identify arrival city from conversation
            - Use Query Local Cities Database to get: city_code, lat, lng, country_code
+             and its ranked airports
            - Verify country code matches step 1
 
         3. ARRIVAL AIRPORTS
-           - Use Query Local Airports Database with city_code (FREE, try first)
-           - If no results, use Get Flight Airports Nearby with lat/lng (PAID, max once)
-           - Distance: 30 km, ignore heliports and low popularity airports
+           - Use the airports already attached to the city (ranked, within 30 km)
+           - If none are attached, use Query Local Airports Database with city_code
+           - If still no results, use Query Local Nearby Airports with lat/lng (FREE)
+           - Distance: 30 km (heliports and low popularity airports are already filtered out)
 
         4. ARRIVAL DATE
            - Extract arrival date from conversation (format: YYYY-MM-DD)
@@ -135,21 +336,111 @@ class FlightConciergeAgent:
         Return only the departure information.
         """
 
-        return self._agent.kickoff(prompt.strip(), response_format=ArrivalData).pydantic
+        return self._kickoff("process_arrival_information", prompt, ArrivalData)
+
+    def process_trip_legs(self, messages: list[Message]) -> TripLegs:
+        """Extract departure and arrival of every leg in one call, so both ends
+        share the conversation tokens and the tool results."""
+        prompt = f"""
+        As a Senior Travel Concierge, extract and process the DEPARTURE and ARRIVAL information
+        of every flight leg of the trip.
+
+        CONVERSATION HISTORY:
+        {self._context_messages(messages)}
+
+        YOUR TASK: Extract the details of both ends using TOP-DOWN approach:
+
+        1. COUNTRIES
+           - Identify departure and arrival countries from conversation
+           - Use Query Local Countries Database to verify and get country codes
+
+        2. CITIES
+           - Identify departure and arrival cities from conversation
+           - Use Query Local Cities Database to get: city_code, lat, lng, country_code
+             and its ranked airports
+           - Verify country codes match step 1
+
+        3. AIRPORTS
+           - Use the airports already attached to each city (ranked, within 30 km)
+           - If none are attached, use Query Local Airports Database with city_code
+           - If still no results, use Query Local Nearby Airports with lat/lng (FREE)
+           - Distance: 30 km (heliports and low popularity airports are already filtered out)
+
+        4. DATES
+           - Extract departure and return dates from conversation (format: YYYY-MM-DD)
+
+        5. LEGS
+           - First leg: departure -> arrival, on the departure date
+           - Only if the user gave a return date, add a second leg: arrival -> departure,
+             on the return date, reusing the locations found above (no new lookups)
+           - Set each leg's date and the date of both of its ends to that leg's date
+
+        Return only the legs.
+        """
+
+        return self._kickoff("process_trip_legs", prompt, TripLegs)
 
-    def confirm_trip_data_with_user(self, messages: list[Message], trip_data: TripData):
+    def summarize_conversation(
+        self, summary: str, messages: list[Message]
+    ) -> ConversationSummary:
+        """Fold `messages` into the rolling conversation summary."""
+        prompt = f"""
+        As a Senior Travel Concierge, keep a running summary of your conversation with the traveler.
+
+        CURRENT SUMMARY:
+        {summary or "(empty)"}
+
+        NEW MESSAGES:
+        {self._context_messages(messages)}
+
+        YOUR TASK:
+        - Fold the new messages into the current summary
+        - Keep every travel fact: cities, airports, dates, preferences and what was approved
+        - When a fact was corrected, keep only its latest value
+        - Drop greetings and small talk
+        - Keep it under 150 words
+
+        Return ONLY:
+        - summary: The updated summary
+        """
+
+        return self._complete("summarize_conversation", prompt, ConversationSummary)
+
+    def extract_travel_date(
+        self, messages: list[Message], direction: Literal["departure", "arrival"]
+    ) -> TravelDate:
+        """Extract only the date, for locations already resolved locally."""
+        prompt = f"""
+        Today is {datetime.now().strftime("%Y-%m-%d")}.
+
+        CONVERSATION HISTORY:
+        {self._context_messages(messages)}
+
+        YOUR TASK:
+        - Extract the {direction.upper()} date of the trip from the conversation
+        - Resolve relative dates (e.g. "next Friday", "dia 13") against today's date
+        - Leave it empty if the user did not give one
+
+        Return ONLY:
+        - date: The {direction} date (format: YYYY-MM-DD)
+        """
+
+        return self._complete("extract_travel_date", prompt, TravelDate)
+
+    def confirm_trip_data_with_user(
+        self, messages: list[Message], trip_data: TripData, as_patch: bool = False
+    ):
+        """With `as_patch`, the model returns a `TripDataUpdate` holding only the
+        changes to `trip_data` instead of regenerating all of it."""
         prompt = f"""
         As a Senior Travel Concierge, compile the trip details, present them to the user,
         and review them if necessary.
 
         CONVERSATION HISTORY:
-        {self._latest_messages(messages)}
-
-        DEPARTURE INFORMATION:
-        {trip_data.legs[0].departure.model_dump_json()}
+        {self._context_messages(messages)}
 
-        ARRIVAL INFORMATION:
-        {trip_data.legs[0].arrival.model_dump_json()}
+        TRIP DATA (the first leg, then any further legs already extracted; keep them all):
+        {json.dumps(trip_data.prompt_view())}
 
         YOUR TASK:
         1. Review all departure and arrival information gathered
@@ -170,14 +461,20 @@ class FlightConciergeAgent:
         split in the following sections:
             * First leg: departure and arrival details (with both city/airports along with dates)
             * Second leg: same as the first one (if applicable in case it is a round trip)
-        - metadata: The complete TripData information with all known information filled
+        {TRIP_DATA_PATCH_RETURN if as_patch else TRIP_DATA_RETURN}
 
         If any critical information is still missing, clearly ask for it.
         """
 
-        return self._agent.kickoff(prompt.strip(), response_format=Interaction).pydantic
+        return self._kickoff(
+            "confirm_trip_data_with_user",
+            prompt,
+            TripDataUpdate if as_patch else Interaction,
+        )
 
-    def acknowledge_trip_plan_feedback(self, messages: list[Message]):
+    def acknowledge_trip_plan_feedback(
+        self, messages: list[Message], on_token: TokenCallback | None = None
+    ):
         prompt = f"""
         As a Senior Travel Concierge, acknowledge the trip plan feedback from the user.
 
@@ -194,17 +491,23 @@ class FlightConciergeAgent:
         - assistant_response: Your brief acknowledgment message (1-2 sentences max)
         """
 
-        return self._agent.kickoff(prompt.strip(), response_format=Interaction).pydantic
+        return self._kickoff(
+            "acknowledge_trip_plan_feedback",
+            prompt,
+            Interaction,
+            tier="fast",
+            on_token=on_token,
+        )
 
-    def act_on_trip_plan_feedback(self, messages: list[Message], trip_data: TripData):
+    def act_on_trip_plan_feedback(
+        self, messages: list[Message], trip_data: TripData, as_patch: bool = False
+    ):
+        """See `confirm_trip_data_with_user` for `as_patch`."""
         prompt = f"""
         As a Senior Travel Concierge, act on the trip plan feedback from the user.
 
-        LATEST TRIP DATA:
-        {trip_data.model_dump_json()}
-
-        LATEST REVIEW:
-        {trip_data.reviews[-1].model_dump_json()}
+        LATEST TRIP DATA (with the latest review):
+        {json.dumps(trip_data.prompt_view())}
 
         YOUR TASK:
         1. Analyze the human feedback from the latest review
@@ -228,12 +531,18 @@ class FlightConciergeAgent:
         split in the following sections:
             * First leg: departure and arrival details (with both city/airports along with dates)
             * Second leg: same as the first one (if applicable in case it is a round trip)
-        - metadata: The complete TripData information with all known information filled
+        {TRIP_DATA_PATCH_RETURN if as_patch else TRIP_DATA_RETURN}
         """
 
-        return self._agent.kickoff(prompt.strip(), response_format=Interaction).pydantic
+        return self._kickoff(
+            "act_on_trip_plan_feedback",
+            prompt,
+            TripDataUpdate if as_patch else Interaction,
+        )
 
-    def acknowledge_final_trip_planning_details(self, messages: list[Message]):
+    def acknowledge_final_trip_planning_details(
+        self, messages: list[Message], on_token: TokenCallback | None = None
+    ):
         prompt = f"""
         As a Senior Travel Concierge, acknowledge the final trip planning details from the user.
 
@@ -250,22 +559,36 @@ class FlightConciergeAgent:
         - assistant_response: Your brief acknowledgment message (1-2 sentences max)
         """
 
-        return self._agent.kickoff(prompt.strip(), response_format=Interaction).pydantic
+        return self._kickoff(
+            "acknowledge_final_trip_planning_details",
+            prompt,
+            Interaction,
+            tier="fast",
+            on_token=on_token,
+        )
 
-    def look_for_best_flights(self, trip_data: TripData):
+    def look_for_best_flights(
+        self,
+        trip_data: TripData,
+        flight_options: list[LegFlightOptions],
+        on_token: TokenCallback | None = None,
+    ):
+        options = [leg.model_dump(exclude_none=True) for leg in flight_options]
         prompt = f"""
-        As a Senior Travel Concierge, look for the best flights available for the trip.
+        As a Senior Travel Concierge, present the best flights available for the trip.
 
         FINAL TRIP DATA:
-        {trip_data.model_dump_json()}
+        {json.dumps(trip_data.prompt_view())}
+
+        FLIGHT OPTIONS (already searched across every airport of each city and ranked best first, per leg):
+        {json.dumps(options)}
 
         YOUR TASK:
-        - Look for the best flights available
-        - Use 'Find Flights' tool to do this
-        - This tool can be used for round-trips and one-way trips
-          * In case the legs differ in terms of departure and arrival airports,
-          you should call the tool twice (once for each leg as an one-way trip each)
-          * In case the legs are the same airports-wise, you should call the tool once (two-way trip)
+        - Present the best flights for each leg from the options above, keeping their order
+        - Use pareto_optimal to point out the strongest trade-offs (cheapest, fastest, fewest stops)
+        - Only if a leg has no options, use 'Find Flights' tool to look for alternatives
+        - If the traveler's dates are flexible or approximate, use 'Find Flight Price Calendar'
+          once per route to show how prices change around the chosen dates
         - Return the best flights available
 
         RETURN:
@@ -273,4 +596,6 @@ class FlightConciergeAgent:
         written down in a friendly and professional way on the same language as the user's message.
         """
 
-        return self._agent.kickoff(prompt.strip(), response_format=Interaction).pydantic
+        return self._kickoff(
+            "look_for_best_flights", prompt, Interaction, on_token=on_token
+        )
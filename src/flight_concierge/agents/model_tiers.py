@@ -0,0 +1,40 @@
+import os
+from typing import Literal
+
+from crewai import LLM
+from pydantic import BaseModel, Field
+
+Tier = Literal["fast", "smart"]
+
+# "fast" serves acknowledgements, date extraction and approval classification;
+# "smart" serves location extraction, trip planning and flight summaries
+DEFAULT_MODELS: dict[Tier, str] = {"fast": "gpt-4.1-mini", "smart": "gpt-4.1"}
+DEFAULT_TIMEOUT_SECONDS: dict[Tier, str] = {"fast": "15", "smart": "60"}
+
+
+def streaming_enabled() -> bool:
+    return os.getenv("CONCIERGE_STREAMING", "false").lower() == "true"
+
+
+class ModelTier(BaseModel):
+    model: str
+    timeout_seconds: float = Field(
+        gt=0, description="Latency budget of a single LLM call on this tier"
+    )
+
+    def llm(self, stream: bool = False) -> LLM:
+        return LLM(model=self.model, timeout=self.timeout_seconds, stream=stream)
+
+
+def model_tier(tier: Tier) -> ModelTier:
+    """The model and latency budget of `tier`, as currently configured by
+    `CONCIERGE_<TIER>_MODEL` and `CONCIERGE_<TIER>_TIMEOUT_SECONDS`."""
+    name = tier.upper()
+    return ModelTier(
+        model=os.getenv(f"CONCIERGE_{name}_MODEL", DEFAULT_MODELS[tier]),
+        timeout_seconds=float(
+            os.getenv(
+                f"CONCIERGE_{name}_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS[tier]
+            )
+        ),
+    )
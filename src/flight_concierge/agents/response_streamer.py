@@ -0,0 +1,110 @@
+import json
+import re
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from crewai import Agent
+from crewai.events import crewai_event_bus
+from crewai.events.types.llm_events import LLMStreamChunkEvent
+
+TokenCallback = Callable[[str], None]
+
+_CONTENT_START = re.compile(r'"assistant_response"\s*:\s*\{.*?"content"\s*:\s*"', re.S)
+_HIGH_SURROGATE = re.compile(r"\\u[dD][89abAB][0-9a-fA-F]{2}")
+
+
+class AssistantResponseStream:
+    """Incrementally pull the `assistant_response.content` string out of an
+    `Interaction` JSON document as its chunks arrive, passing every newly
+    decoded piece of text to `on_token`."""
+
+    def __init__(self, on_token: TokenCallback):
+        self.on_token = on_token
+        self._buffer = ""
+        self._position: int | None = None
+        self._done = False
+
+    def feed(self, chunk: str):
+        if self._done:
+            return
+        self._buffer += chunk
+        if self._position is None:
+            match = _CONTENT_START.search(self._buffer)
+            if match is None:
+                return
+            self._position = match.end()
+
+        text = self._decode_available()
+        if text:
+            self.on_token(text)
+
+    def _decode_available(self) -> str:
+        """Decode the string from `_position` up to its closing quote or to the
+        last complete escape sequence, whichever comes first."""
+        buffer, position = self._buffer, self._position
+        pieces = []
+        while position < len(buffer):
+            char = buffer[position]
+            if char == '"':
+                self._done = True
+                break
+            if char != "\\":
+                pieces.append(char)
+                position += 1
+                continue
+
+            length = 2
+            if buffer[position + 1 : position + 2] == "u":
+                # A surrogate pair is only decodable as a whole
+                is_high = _HIGH_SURROGATE.match(buffer, position)
+                length = 12 if is_high else 6
+            if position + length > len(buffer):
+                break
+            pieces.append(json.loads(f'"{buffer[position : position + length]}"'))
+            position += length
+
+        self._position = position
+        return "".join(pieces)
+
+
+def print_token(token: str):
+    print(token, end="", flush=True)
+
+
+_streams: dict[str, AssistantResponseStream] = {}
+_streams_lock = threading.Lock()
+_handler_registered = False
+
+
+def _on_stream_chunk(source, event: LLMStreamChunkEvent):
+    if event.tool_call is not None or event.agent_id is None:
+        return
+    with _streams_lock:
+        stream = _streams.get(event.agent_id)
+    if stream is not None:
+        stream.feed(event.chunk)
+
+
+@contextmanager
+def streaming_assistant_response(
+    agent: Agent, on_token: TokenCallback | None
+) -> Iterator[None]:
+    """Send the `assistant_response` tokens `agent` streams while the block
+    runs to `on_token`. The agent must be used by one call at a time."""
+    global _handler_registered
+    if on_token is None:
+        yield
+        return
+
+    with _streams_lock:
+        if not _handler_registered:
+            # The event bus has no way to unregister: route every chunk by agent
+            crewai_event_bus.on(LLMStreamChunkEvent)(_on_stream_chunk)
+            _handler_registered = True
+        _streams[str(agent.id)] = AssistantResponseStream(on_token)
+    try:
+        yield
+    finally:
+        with _streams_lock:
+            del _streams[str(agent.id)]
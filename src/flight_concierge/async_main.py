@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+import asyncio
+from typing import Literal
+
+from crewai.flow import Flow, and_, human_feedback, listen, persist, start
+from crewai.flow.human_feedback import HumanFeedbackResult
+
+from flight_concierge.agents import AsyncFlightConciergeAgent, model_tier
+from flight_concierge.flow_base import FlightConciergeFlowBase
+from flight_concierge.types import FlightConciergeState
+
+
+@persist()
+class AsyncFlightConciergeFlow(FlightConciergeFlowBase, Flow[FlightConciergeState]):
+    """Async-native variant of `FlightConciergeFlow`.
+
+    Every step is a coroutine: LLM calls go through crewai's async kickoff and
+    blocking cache, index and flight search work runs off the event loop, so
+    parallel branches overlap their I/O and one process can run many
+    conversations concurrently with `kickoff_async`.
+    """
+
+    concierge_class = AsyncFlightConciergeAgent
+
+    @start()
+    async def load_initial_context(self):
+        self.state.messages.append(self.state.message)
+        return self.state.messages[-1].content
+
+    @listen(load_initial_context)
+    async def collect_country_codes(self):
+        await self.air_labs_service.ensure_countries_cached_async()
+
+    @listen(load_initial_context)
+    async def collect_city_codes(self):
+        await self.air_labs_service.ensure_cities_cached_async()
+
+    @listen(load_initial_context)
+    async def collect_airport_codes(self):
+        await self.air_labs_service.ensure_airports_cached_async()
+
+    @listen(and_(collect_city_codes, collect_airport_codes))
+    async def collect_city_airports(self):
+        await self.air_labs_service.ensure_city_airports_cached_async()
+
+    @listen(and_(collect_country_codes, collect_city_airports))
+    async def compile_reference_database(self):
+        await self.air_labs_service.ensure_reference_database_compiled_async()
+
+    @listen(compile_reference_database)
+    async def schedule_cache_refresh(self):
+        self.air_labs_service.refresh_stale_in_background()
+
+    @listen(compile_reference_database)
+    async def acknowledge_user_message(self):
+        result = await self.concierge.acknowledge_message(
+            self.state.context_messages(), on_token=self.on_token
+        )
+        return self._record_reply(result)
+
+    @listen(acknowledge_user_message)
+    async def process_departure_details(self):
+        if self.combined_extraction:
+            result = await self.concierge.process_trip_legs(
+                self.state.context_messages()
+            )
+            if result.legs:
+                self.state.trip_data.legs = result.legs
+            return
+
+        result = None
+        if self.location_resolver is not None:
+            result = await asyncio.to_thread(
+                self.location_resolver.resolve_departure, self.state.message.content
+            )
+        if result is None:
+            result = await self.concierge.process_departure_information(
+                self.state.context_messages()
+            )
+        else:
+            travel_date = await self.concierge.extract_travel_date(
+                self.state.context_messages(), "departure"
+            )
+            result.date = travel_date.date
+        self.state.trip_data.legs[0].departure = result
+
+    @listen(acknowledge_user_message)
+    async def process_arrival_details(self):
+        if self.combined_extraction:
+            # Extracted together with the departure in process_departure_details
+            return
+
+        result = None
+        if self.location_resolver is not None:
+            result = await asyncio.to_thread(
+                self.location_resolver.resolve_arrival, self.state.message.content
+            )
+        if result is None:
+            result = await self.concierge.process_arrival_information(
+                self.state.context_messages()
+            )
+        else:
+            travel_date = await self.concierge.extract_travel_date(
+                self.state.context_messages(), "arrival"
+            )
+            result.date = travel_date.date
+        self.state.trip_data.legs[0].arrival = result
+
+    @listen(and_(process_departure_details, process_arrival_details))
+    @human_feedback(
+        message="Please review this trip planning details. Does it meet your needs?",
+        emit=["needs_changes", "approved"],
+        llm=model_tier("fast").llm(),
+    )
+    async def draft_trip_plan(
+        self, human_feedback_result
+    ) -> Literal["needs_changes", "approved"]:
+        result = await self.concierge.confirm_trip_data_with_user(
+            messages=self.state.context_messages(),
+            trip_data=self.state.trip_data,
+            as_patch=self.trip_data_patches,
+        )
+        return self._record_trip_plan(result)
+
+    @listen("needs_changes")
+    async def acknowledge_trip_plan_feedback(
+        self, feedback_result: HumanFeedbackResult
+    ):
+        self._record_review(feedback_result)
+        await self._compact_conversation()
+        result = await self.concierge.acknowledge_trip_plan_feedback(
+            messages=self.state.context_messages(),
+            on_token=self.on_token,
+        )
+        return self._record_reply(result)
+
+    @listen(acknowledge_trip_plan_feedback)
+    @human_feedback(
+        message="Please review the latest trip planning details. Is it better now?",
+        emit=["needs_changes", "approved"],
+        llm=model_tier("fast").llm(),
+    )
+    async def act_on_trip_plan_feedback(self) -> Literal["needs_changes", "approved"]:
+        result = await self.concierge.act_on_trip_plan_feedback(
+            messages=self.state.context_messages(),
+            trip_data=self.state.trip_data,
+            as_patch=self.trip_data_patches,
+        )
+        return self._record_trip_plan(result)
+
+    @listen("approved")
+    async def booking_route(self, feedback_result: HumanFeedbackResult):
+        self._record_feedback(feedback_result)
+        await self._compact_conversation()
+        result = await self.concierge.acknowledge_final_trip_planning_details(
+            self.state.context_messages(), on_token=self.on_token
+        )
+        return self._record_reply(result, keep_interaction=True)
+
+    @listen(booking_route)
+    async def look_for_best_flights(self):
+        flight_options = await asyncio.to_thread(self._find_flight_options)
+        result = await self.concierge.look_for_best_flights(
+            trip_data=self.state.trip_data,
+            flight_options=flight_options,
+            on_token=self.on_token,
+        )
+        return self._record_reply(result, keep_interaction=True)
+
+    async def _compact_conversation(self):
+        """Fold the messages that no longer fit the token budget into the
+        rolling summary, once per turn."""
+        older = self.state.messages_to_summarize()
+        if not older:
+            return
+        result = await self.concierge.summarize_conversation(
+            self.state.conversation_summary, older
+        )
+        self._apply_conversation_summary(older, result)
+
+
+def kickoff():
+    asyncio.run(
+        AsyncFlightConciergeFlow().kickoff_async(
+            inputs={
+                "message": {
+                    "role": "user",
+                    "content": "Gostaria de viajar de Recife para Campinas em 10 de fevereiro e retornar dia 13",
+                },
+            }
+        )
+    )
+
+
+def plot():
+    AsyncFlightConciergeFlow().plot()
+
+
+if __name__ == "__main__":
+    kickoff()
@@ -0,0 +1,146 @@
+import os
+
+from crewai.flow.human_feedback import HumanFeedbackResult
+
+from flight_concierge.agents import (
+    FlightConciergeAgent,
+    TokenCallback,
+    print_token,
+    streaming_enabled,
+)
+from flight_concierge.services import (
+    AirLabsService,
+    FlightPrefetcher,
+    FlightSearchOrchestrator,
+    LocationResolver,
+    flight_prefetch_enabled,
+    location_fast_path_enabled,
+)
+from flight_concierge.types import (
+    ConversationSummary,
+    FlightConciergeState,
+    Interaction,
+    LegFlightOptions,
+    Message,
+    Review,
+    TripData,
+    TripDataUpdate,
+)
+
+PATCH_FAILED_RESPONSE = (
+    "Sorry, I couldn't apply that change to your trip, so it is unchanged. "
+    "Could you describe the change again?"
+)
+
+
+class FlightConciergeFlowBase:
+    """Collaborators and state updates shared by `FlightConciergeFlow` and
+    `AsyncFlightConciergeFlow`.
+
+    Mix it in before `Flow`: the flows only define the steps, which differ in
+    whether they call the concierge directly or await it.
+    """
+
+    concierge_class: type[FlightConciergeAgent] = FlightConciergeAgent
+    state: FlightConciergeState
+
+    def __init__(self, *args, on_token: TokenCallback | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if on_token is None and streaming_enabled():
+            on_token = print_token
+        self.on_token = on_token
+        self.air_labs_service = AirLabsService()
+        self.concierge = self.concierge_class.shared()
+        self.location_resolver = (
+            LocationResolver() if location_fast_path_enabled() else None
+        )
+        self.combined_extraction = (
+            os.getenv("COMBINED_EXTRACTION", "false").lower() == "true"
+        )
+        self.flight_prefetcher = (
+            FlightPrefetcher() if flight_prefetch_enabled() else None
+        )
+        self.trip_data_patches = (
+            os.getenv("TRIP_DATA_PATCHES", "false").lower() == "true"
+        )
+
+    def _record_reply(self, result: Interaction, keep_interaction: bool = False):
+        self.state.messages.append(result.assistant_response)
+        if keep_interaction:
+            self.state.interactions.append(result)
+        return result.assistant_response.content
+
+    def _record_trip_plan(self, result: Interaction | TripDataUpdate):
+        """Take the drafted trip data, reply with it and prefetch its flights."""
+        result = self._update_trip_data(result)
+        reply = self._record_reply(result, keep_interaction=True)
+        self._prefetch_flights()
+        return reply
+
+    def _record_feedback(self, feedback_result: HumanFeedbackResult):
+        self.state.messages.append(
+            Message(role="user", content=feedback_result.feedback)
+        )
+
+    def _record_review(self, feedback_result: HumanFeedbackResult):
+        self._record_feedback(feedback_result)
+        self.state.trip_data.reviews.append(
+            Review(
+                agent_output=str(feedback_result.output),
+                human_feedback=feedback_result.feedback,
+                outcome=feedback_result.outcome,
+            )
+        )
+
+    def _apply_conversation_summary(
+        self, older: list[Message], result: ConversationSummary
+    ):
+        self.state.conversation_summary = result.summary
+        self.state.summarized_count += len(older)
+
+    def _update_trip_data(self, result: Interaction | TripDataUpdate) -> Interaction:
+        """Apply the agent's trip data patch, or merge its full TripData over the
+        current one. A response without TripData leaves the trip data as it
+        was; so does an invalid patch, whose response is replaced so the user
+        isn't told the change was made."""
+        if isinstance(result, TripDataUpdate):
+            assistant_response = result.assistant_response
+            try:
+                self.state.trip_data = result.patch.apply_to(self.state.trip_data)
+            except ValueError as e:
+                print(f"Discarding invalid trip data patch: {e}")
+                assistant_response = Message(
+                    role="assistant", content=PATCH_FAILED_RESPONSE
+                )
+            return Interaction(
+                assistant_response=assistant_response,
+                metadata=self.state.trip_data,
+            )
+
+        if not isinstance(result.metadata, TripData):
+            # e.g. the concierge is still asking for missing details
+            return Interaction(
+                assistant_response=result.assistant_response,
+                metadata=self.state.trip_data,
+            )
+
+        # The prompt only carries a compact view: keep what it left out
+        self.state.trip_data = result.metadata.restore_hidden_fields(
+            self.state.trip_data
+        )
+        result.metadata = self.state.trip_data
+        return result
+
+    def _prefetch_flights(self):
+        """Start searching the drafted trip while the user reviews it."""
+        if self.flight_prefetcher is not None:
+            self.flight_prefetcher.prefetch(self.state.trip_data)
+
+    def _find_flight_options(self) -> list[LegFlightOptions]:
+        """The prefetched flights if they still match the trip, else a new search."""
+        flight_options = None
+        if self.flight_prefetcher is not None:
+            flight_options = self.flight_prefetcher.take(self.state.trip_data)
+        if flight_options is None:
+            flight_options = FlightSearchOrchestrator().search(self.state.trip_data)
+        return flight_options
@@ -4,16 +4,14 @@ from typing import Literal
 from crewai.flow import Flow, and_, human_feedback, listen, persist, start
 from crewai.flow.human_feedback import HumanFeedbackResult
 
-from flight_concierge.agents.flight_concierge_agent import FlightConciergeAgent
-from flight_concierge.services import AirLabsService
-from flight_concierge.types import FlightConciergeState, Message, Review
+from flight_concierge.agents import FlightConciergeAgent, model_tier
+from flight_concierge.flow_base import FlightConciergeFlowBase
+from flight_concierge.types import FlightConciergeState
 
 
 @persist()
-class FlightConciergeFlow(Flow[FlightConciergeState]):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.air_labs_service = AirLabsService()
+class FlightConciergeFlow(FlightConciergeFlowBase, Flow[FlightConciergeState]):
+    concierge_class = FlightConciergeAgent
 
     @start()
     def load_initial_context(self):
@@ -32,95 +30,136 @@ class FlightConciergeFlow(Flow[FlightConciergeState]):
     def collect_airport_codes(self):
         self.air_labs_service.ensure_airports_cached()
 
-    @listen(and_(collect_country_codes, collect_city_codes, collect_airport_codes))
+    @listen(and_(collect_city_codes, collect_airport_codes))
+    def collect_city_airports(self):
+        self.air_labs_service.ensure_city_airports_cached()
+
+    @listen(and_(collect_country_codes, collect_city_airports))
+    def compile_reference_database(self):
+        self.air_labs_service.ensure_reference_database_compiled()
+
+    @listen(compile_reference_database)
+    def schedule_cache_refresh(self):
+        self.air_labs_service.refresh_stale_in_background()
+
+    @listen(compile_reference_database)
     def acknowledge_user_message(self):
-        result = FlightConciergeAgent().acknowledge_message(self.state.messages)
-        self.state.messages.append(result.assistant_response)
-        return self.state.messages[-1].content
+        result = self.concierge.acknowledge_message(
+            self.state.context_messages(), on_token=self.on_token
+        )
+        return self._record_reply(result)
 
     @listen(acknowledge_user_message)
     def process_departure_details(self):
-        result = FlightConciergeAgent().process_departure_information(
-            self.state.messages
-        )
+        if self.combined_extraction:
+            result = self.concierge.process_trip_legs(self.state.context_messages())
+            if result.legs:
+                self.state.trip_data.legs = result.legs
+            return
+
+        result = None
+        if self.location_resolver is not None:
+            result = self.location_resolver.resolve_departure(
+                self.state.message.content
+            )
+        if result is None:
+            result = self.concierge.process_departure_information(
+                self.state.context_messages()
+            )
+        else:
+            result.date = self.concierge.extract_travel_date(
+                self.state.context_messages(), "departure"
+            ).date
         self.state.trip_data.legs[0].departure = result
 
     @listen(acknowledge_user_message)
     def process_arrival_details(self):
-        result = FlightConciergeAgent().process_arrival_information(self.state.messages)
+        if self.combined_extraction:
+            # Extracted together with the departure in process_departure_details
+            return
+
+        result = None
+        if self.location_resolver is not None:
+            result = self.location_resolver.resolve_arrival(self.state.message.content)
+        if result is None:
+            result = self.concierge.process_arrival_information(
+                self.state.context_messages()
+            )
+        else:
+            result.date = self.concierge.extract_travel_date(
+                self.state.context_messages(), "arrival"
+            ).date
         self.state.trip_data.legs[0].arrival = result
 
     @listen(and_(process_departure_details, process_arrival_details))
     @human_feedback(
         message="Please review this trip planning details. Does it meet your needs?",
         emit=["needs_changes", "approved"],
-        llm="gpt-4.1",
+        llm=model_tier("fast").llm(),
     )
     def draft_trip_plan(
         self, human_feedback_result
     ) -> Literal["needs_changes", "approved"]:
-        result = FlightConciergeAgent().confirm_trip_data_with_user(
-            messages=self.state.messages,
+        result = self.concierge.confirm_trip_data_with_user(
+            messages=self.state.context_messages(),
             trip_data=self.state.trip_data,
+            as_patch=self.trip_data_patches,
         )
-        self.state.trip_data = result.metadata
-        self.state.messages.append(result.assistant_response)
-        self.state.interactions.append(result)
-        return result.assistant_response.content
+        return self._record_trip_plan(result)
 
     @listen("needs_changes")
     def acknowledge_trip_plan_feedback(self, feedback_result: HumanFeedbackResult):
-        user_message = Message(role="user", content=feedback_result.feedback)
-        self.state.messages.append(user_message)
-        self.state.trip_data.reviews.append(
-            Review(
-                agent_output=str(feedback_result.output),
-                human_feedback=feedback_result.feedback,
-                outcome=feedback_result.outcome,
-            )
+        self._record_review(feedback_result)
+        self._compact_conversation()
+        result = self.concierge.acknowledge_trip_plan_feedback(
+            messages=self.state.context_messages(),
+            on_token=self.on_token,
         )
-        result = FlightConciergeAgent().acknowledge_trip_plan_feedback(
-            messages=self.state.messages,
-        )
-        self.state.messages.append(result.assistant_response)
-        return self.state.messages[-1].content
+        return self._record_reply(result)
 
     @listen(acknowledge_trip_plan_feedback)
     @human_feedback(
         message="Please review the latest trip planning details. Is it better now?",
         emit=["needs_changes", "approved"],
-        llm="gpt-4.1",
+        llm=model_tier("fast").llm(),
     )
     def act_on_trip_plan_feedback(self) -> Literal["needs_changes", "approved"]:
-        result = FlightConciergeAgent().act_on_trip_plan_feedback(
-            messages=self.state.messages,
+        result = self.concierge.act_on_trip_plan_feedback(
+            messages=self.state.context_messages(),
             trip_data=self.state.trip_data,
+            as_patch=self.trip_data_patches,
         )
-        self.state.trip_data = result.metadata
-        self.state.messages.append(result.assistant_response)
-        self.state.interactions.append(result)
-        return result.assistant_response.content
+        return self._record_trip_plan(result)
 
     @listen("approved")
     def booking_route(self, feedback_result: HumanFeedbackResult):
-        self.state.messages.append(
-            Message(role="user", content=feedback_result.feedback)
+        self._record_feedback(feedback_result)
+        self._compact_conversation()
+        result = self.concierge.acknowledge_final_trip_planning_details(
+            self.state.context_messages(), on_token=self.on_token
         )
-        result = FlightConciergeAgent().acknowledge_final_trip_planning_details(
-            self.state.messages
-        )
-        self.state.messages.append(result.assistant_response)
-        self.state.interactions.append(result)
-        return self.state.messages[-1].content
+        return self._record_reply(result, keep_interaction=True)
 
     @listen(booking_route)
     def look_for_best_flights(self):
-        result = FlightConciergeAgent().look_for_best_flights(
+        flight_options = self._find_flight_options()
+        result = self.concierge.look_for_best_flights(
             trip_data=self.state.trip_data,
+            flight_options=flight_options,
+            on_token=self.on_token,
         )
-        self.state.messages.append(result.assistant_response)
-        self.state.interactions.append(result)
-        return self.state.messages[-1].content
+        return self._record_reply(result, keep_interaction=True)
+
+    def _compact_conversation(self):
+        """Fold the messages that no longer fit the token budget into the
+        rolling summary, once per turn."""
+        older = self.state.messages_to_summarize()
+        if not older:
+            return
+        result = self.concierge.summarize_conversation(
+            self.state.conversation_summary, older
+        )
+        self._apply_conversation_summary(older, result)
 
 
 def kickoff():
@@ -1,3 +1,24 @@
 from .air_labs_service import AirLabsService
+from .flight_prefetcher import FlightPrefetcher, flight_prefetch_enabled
+from .flight_ranker import FlightRanker, FlightRankingWeights
+from .flight_search_cache import FlightSearchCache
+from .flight_search_orchestrator import FlightSearchOrchestrator
+from .google_flights_service import FlightSearchError, GoogleFlightsService
+from .llm_response_cache import LLMResponseCache, llm_response_cache_enabled
+from .location_resolver import LocationResolver, location_fast_path_enabled
 
-__all__ = ["AirLabsService"]
+__all__ = [
+    "AirLabsService",
+    "FlightPrefetcher",
+    "FlightRanker",
+    "FlightRankingWeights",
+    "FlightSearchCache",
+    "FlightSearchError",
+    "FlightSearchOrchestrator",
+    "GoogleFlightsService",
+    "LLMResponseCache",
+    "LocationResolver",
+    "flight_prefetch_enabled",
+    "llm_response_cache_enabled",
+    "location_fast_path_enabled",
+]
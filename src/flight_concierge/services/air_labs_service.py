@@ -1,49 +1,329 @@
+import asyncio
 import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import ClassVar
 
+import portalocker
+import requests
 from get_flight_airport_codes import GetFlightAirportCodes
 from get_flight_city_codes import GetFlightCityCodes
 from get_flight_country_codes import GetFlightCountryCodes
 
+from flight_concierge.stores import (
+    AirportsStore,
+    CitiesStore,
+    CityAirportsStore,
+    CountriesStore,
+    JsonArrayWriter,
+    build_city_airports,
+    compile_reference_database,
+    compiled_reference_enabled,
+    iter_json_array,
+)
+
+AIRLABS_API_URL = "https://airlabs.co/api/v9"
+LOCK_TIMEOUT_SECONDS = 600
+STREAMING_CHUNK_SIZE = 64 * 1024
+STREAMING_TIMEOUT_SECONDS = 60
+DEFAULT_CACHE_TTL_HOURS = 24 * 7
+
+DATASETS = {
+    "countries": (GetFlightCountryCodes, CountriesStore, ("code",)),
+    "cities": (GetFlightCityCodes, CitiesStore, ("city_code",)),
+    "airports": (GetFlightAirportCodes, AirportsStore, ("iata_code", "icao_code")),
+}
+
 
 class AirLabsService:
-    def __init__(self):
+    # Shared by every instance so concurrent flows in one process single-flight too
+    _dataset_locks: ClassVar[dict[str, threading.Lock]] = defaultdict(threading.Lock)
+    _dataset_locks_guard: ClassVar[threading.Lock] = threading.Lock()
+    _refresh_thread: ClassVar[threading.Thread | None] = None
+
+    def __init__(self, db_folder: Path | None = None):
         self.project_root = Path(__file__).parent.parent.parent.parent
-        self.db_folder = self.project_root / "db"
+        self.db_folder = db_folder or self.project_root / "db"
         self.db_folder.mkdir(exist_ok=True)
+        self.streaming = os.getenv("AIRLABS_STREAMING", "false").lower() == "true"
+        self.cache_ttl = timedelta(
+            hours=float(os.getenv("AIRLABS_CACHE_TTL_HOURS", DEFAULT_CACHE_TTL_HOURS))
+        )
 
     def ensure_countries_cached(self):
-        countries_file = self.db_folder / "countries.json"
+        self._ensure_dataset_cached("countries")
+
+    def ensure_cities_cached(self):
+        self._ensure_dataset_cached("cities")
 
-        if not countries_file.exists():
-            print("Fetching countries from API...")
-            data = GetFlightCountryCodes().run()
-            countries_data = data["response"]
+    def ensure_airports_cached(self):
+        self._ensure_dataset_cached("airports")
 
-            with open(countries_file, "w") as f:
-                json.dump(countries_data, f, indent=2)
-            print(f"Countries cached to {countries_file}")
+    async def ensure_countries_cached_async(self):
+        await asyncio.to_thread(self.ensure_countries_cached)
 
-    def ensure_cities_cached(self):
-        cities_file = self.db_folder / "cities.json"
+    async def ensure_cities_cached_async(self):
+        await asyncio.to_thread(self.ensure_cities_cached)
 
-        if not cities_file.exists():
-            print("Fetching cities from API...")
-            data = GetFlightCityCodes().run()
-            cities_data = data["response"]
+    async def ensure_airports_cached_async(self):
+        await asyncio.to_thread(self.ensure_airports_cached)
 
-            with open(cities_file, "w") as f:
-                json.dump(cities_data, f, indent=2)
-            print(f"Cities cached to {cities_file}")
+    async def ensure_city_airports_cached_async(self):
+        await asyncio.to_thread(self.ensure_city_airports_cached)
 
-    def ensure_airports_cached(self):
+    async def ensure_reference_database_compiled_async(self):
+        await asyncio.to_thread(self.ensure_reference_database_compiled)
+
+    def refresh_stale_in_background(self):
+        """Refresh datasets older than the TTL on a daemon thread.
+
+        The current files keep being served until each refreshed dataset is
+        fully written and indexed, so no request waits on a refresh.
+        """
+        with self._dataset_locks_guard:
+            refresh_thread = AirLabsService._refresh_thread
+            if refresh_thread is not None and refresh_thread.is_alive():
+                return
+            if not any(self._is_expired(name) for name in DATASETS):
+                return
+
+            refresh_thread = threading.Thread(
+                target=self._refresh_stale, name="airlabs-cache-refresh", daemon=True
+            )
+            AirLabsService._refresh_thread = refresh_thread
+            refresh_thread.start()
+
+    def ensure_city_airports_cached(self):
+        cities_file = self.db_folder / "cities.json"
         airports_file = self.db_folder / "airports.json"
+        city_airports_file = self.db_folder / "city_airports.json"
+
+        def is_stale():
+            return (
+                not city_airports_file.exists()
+                or city_airports_file.stat().st_mtime < cities_file.stat().st_mtime
+                or city_airports_file.stat().st_mtime < airports_file.stat().st_mtime
+            )
+
+        if not is_stale():
+            return
+
+        with self._dataset_lock("city_airports"):
+            if not is_stale():
+                return
+
+            print("Building city airports table...")
+            city_airports_data = build_city_airports(
+                CitiesStore.shared().rows, AirportsStore.shared()
+            )
+            with CityAirportsStore.shared().reloading():
+                self._write_atomically(city_airports_file, city_airports_data)
+            print(f"City airports cached to {city_airports_file}")
+
+    def ensure_reference_database_compiled(self):
+        """Compile the JSON cache into the memory-mapped SQLite format, if enabled."""
+        if not compiled_reference_enabled():
+            return
+
+        compiled_file = self.db_folder / "reference.sqlite"
+        sources = [
+            self.db_folder / name
+            for name in (
+                "countries.json",
+                "cities.json",
+                "airports.json",
+                "city_airports.json",
+            )
+        ]
+
+        def is_stale():
+            return not compiled_file.exists() or any(
+                compiled_file.stat().st_mtime < source.stat().st_mtime
+                for source in sources
+            )
+
+        if not is_stale():
+            return
+
+        with self._dataset_lock("reference"):
+            if not is_stale():
+                return
+
+            print("Compiling reference database...")
+            compile_reference_database(
+                self.db_folder,
+                [
+                    CountriesStore.shared(),
+                    CitiesStore.shared(),
+                    AirportsStore.shared(),
+                    CityAirportsStore.shared(),
+                ],
+            )
+            print(f"Reference database compiled to {compiled_file}")
+
+    def _ensure_dataset_cached(self, name: str):
+        dataset_file = self.db_folder / f"{name}.json"
+
+        if dataset_file.exists():
+            return
+
+        with self._dataset_lock(name):
+            # Another thread or process may have fetched it while we waited
+            if dataset_file.exists():
+                return
+
+            started_at = time.perf_counter()
+            with JsonArrayWriter(dataset_file) as writer:
+                for row in self._fetch_dataset(name):
+                    writer.write(row)
+                writer.commit()
+            self._write_metadata(name, writer.rows, time.perf_counter() - started_at)
+            print(f"{name.capitalize()} cached to {dataset_file}")
+
+    def _refresh_stale(self):
+        refreshed = False
+        for name in DATASETS:
+            try:
+                refreshed = self._refresh_dataset(name) or refreshed
+            # Network and disk errors (requests' included), bad payloads, lock timeouts
+            except (OSError, ValueError, KeyError, portalocker.LockException) as e:
+                print(f"Failed to refresh {name}, keeping the cached copy: {e}")
+
+        if refreshed:
+            self.ensure_city_airports_cached()
+            self.ensure_reference_database_compiled()
+
+    def _refresh_dataset(self, name: str) -> bool:
+        """Re-fetch an expired dataset, diffing rows against the cached copy as
+        they arrive; return whether any row changed."""
+        if not self._is_expired(name):
+            return False
+
+        with self._dataset_lock(name):
+            if not self._is_expired(name):
+                return False
+
+            _, store_class, key_fields = DATASETS[name]
+            store = store_class.shared()
+            dataset_file = self.db_folder / f"{name}.json"
+            cached = {self._row_key(row, key_fields): row for row in store.rows}
+            seen = set()
+            added = changed = 0
+
+            started_at = time.perf_counter()
+            with JsonArrayWriter(dataset_file) as writer:
+                for row in self._fetch_dataset(name):
+                    key = self._row_key(row, key_fields)
+                    seen.add(key)
+                    if key not in cached:
+                        added += 1
+                    elif cached[key] != row:
+                        changed += 1
+                    writer.write(row)
+                removed = len(cached.keys() - seen)
+                fetch_seconds = time.perf_counter() - started_at
+
+                if not (added or removed or changed):
+                    print(f"{name.capitalize()} unchanged upstream")
+                    self._write_metadata(name, writer.rows, fetch_seconds)
+                    return False
+
+                print(
+                    f"{name.capitalize()} changed upstream: "
+                    f"{added} added, {removed} removed, {changed} changed"
+                )
+                with store.reloading():
+                    writer.commit()
+
+            self._write_metadata(name, writer.rows, fetch_seconds)
+            print(f"{name.capitalize()} cached to {dataset_file}")
+            return True
+
+    def _fetch_dataset(self, name: str) -> Iterator[dict]:
+        print(f"Fetching {name} from API...")
+        yield from self._iter_upstream_rows(name)
+
+    def _iter_upstream_rows(self, name: str) -> Iterator[dict]:
+        if not self.streaming:
+            fetcher, _, _ = DATASETS[name]
+            yield from fetcher().run()["response"]
+            return
+
+        # Decode rows as the body arrives so peak memory is one chunk, not the dataset
+        with requests.get(
+            f"{AIRLABS_API_URL}/{name}",
+            params={"api_key": os.getenv("AIRLABS_API_KEY")},
+            stream=True,
+            timeout=STREAMING_TIMEOUT_SECONDS,
+        ) as response:
+            response.raise_for_status()
+            yield from iter_json_array(
+                response.iter_content(chunk_size=STREAMING_CHUNK_SIZE), key="response"
+            )
+
+    @staticmethod
+    def _row_key(row: dict, key_fields: tuple[str, ...]) -> tuple:
+        return tuple(row.get(field) for field in key_fields)
+
+    def _write_metadata(self, name: str, row_count: int, fetch_seconds: float):
+        print(f"Fetched {row_count} {name} in {fetch_seconds:.2f}s")
+        self._write_atomically(
+            self.db_folder / f"{name}.meta.json",
+            {
+                "fetched_at": datetime.now(timezone.utc).isoformat(),
+                "rows": row_count,
+                "fetch_seconds": round(fetch_seconds, 3),
+            },
+        )
+
+    def _fetched_at(self, name: str) -> datetime | None:
+        metadata_file = self.db_folder / f"{name}.meta.json"
+        dataset_file = self.db_folder / f"{name}.json"
+        if metadata_file.exists():
+            with open(metadata_file, "r") as f:
+                return datetime.fromisoformat(json.load(f)["fetched_at"])
+        if dataset_file.exists():
+            # Caches written before metadata existed: fall back to the file's age
+            return datetime.fromtimestamp(dataset_file.stat().st_mtime, timezone.utc)
+        return None
+
+    def _is_expired(self, name: str) -> bool:
+        fetched_at = self._fetched_at(name)
+        return (
+            fetched_at is not None
+            and datetime.now(timezone.utc) - fetched_at > self.cache_ttl
+        )
+
+    @contextmanager
+    def _dataset_lock(self, name: str):
+        """Single-flight a dataset build across threads (in-process lock) and
+        processes (advisory file lock next to the cache)."""
+        with self._dataset_locks_guard:
+            thread_lock = self._dataset_locks[name]
 
-        if not airports_file.exists():
-            print("Fetching airports from API...")
-            data = GetFlightAirportCodes().run()
-            airports_data = data["response"]
+        with thread_lock:
+            with portalocker.Lock(
+                self.db_folder / f".{name}.lock", timeout=LOCK_TIMEOUT_SECONDS
+            ):
+                yield
 
-            with open(airports_file, "w") as f:
-                json.dump(airports_data, f, indent=2)
-            print(f"Airports cached to {airports_file}")
+    def _write_atomically(self, target: Path, data):
+        """Write JSON to a temp file in the same folder, then rename it over the
+        target so readers only ever see a complete file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.db_folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
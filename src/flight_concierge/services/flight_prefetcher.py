@@ -0,0 +1,115 @@
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import ClassVar
+
+from flight_concierge.services.flight_search_orchestrator import (
+    FlightSearchOrchestrator,
+)
+from flight_concierge.services.google_flights_service import FlightSearchError
+from flight_concierge.types import (
+    ArrivalData,
+    DepartureData,
+    LegFlightOptions,
+    TripData,
+)
+
+MAX_CONCURRENT_PREFETCHES = 4
+
+
+def flight_prefetch_enabled() -> bool:
+    return os.getenv("FLIGHT_PREFETCH", "false").lower() == "true"
+
+
+class FlightPrefetcher:
+    """Search flights for a drafted trip in the background while the user
+    reviews it.
+
+    Each prefetch is keyed by a fingerprint of everything the search depends
+    on (airports, cities, countries and dates of every leg). `take()` only
+    hands the results over if the approved trip has the same fingerprint;
+    a changed plan drops them and searches again.
+    """
+
+    # Shared by the prefetchers of every flow; each search still fans out on
+    # the orchestrator's own pool
+    _executor: ClassVar[ThreadPoolExecutor] = ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_PREFETCHES, thread_name_prefix="flight-prefetch"
+    )
+
+    def __init__(self, orchestrator: FlightSearchOrchestrator | None = None):
+        self.orchestrator = orchestrator or FlightSearchOrchestrator()
+        self._lock = threading.Lock()
+        self._fingerprint: str | None = None
+        self._future: Future | None = None
+
+    def prefetch(self, trip_data: TripData):
+        """Start searching `trip_data` unless it is incomplete or already
+        being searched."""
+        if not self.is_ready(trip_data):
+            return
+
+        fingerprint = self.fingerprint(trip_data)
+        with self._lock:
+            if fingerprint == self._fingerprint:
+                return
+            if self._future is not None:
+                self._future.cancel()
+            print("Prefetching flights for the drafted trip...")
+            self._fingerprint = fingerprint
+            self._future = self._executor.submit(
+                self.orchestrator.search, trip_data.model_copy(deep=True)
+            )
+
+    def take(self, trip_data: TripData) -> list[LegFlightOptions] | None:
+        """Return the prefetched options if they match `trip_data`, waiting for
+        a search still in flight; otherwise None."""
+        with self._lock:
+            future, fingerprint = self._future, self._fingerprint
+            self._future = self._fingerprint = None
+
+        if future is None:
+            return None
+        if fingerprint != self.fingerprint(trip_data):
+            future.cancel()
+            print("Trip changed since the prefetch, discarding its flights")
+            return None
+        try:
+            return future.result()
+        except (CancelledError, FlightSearchError, OSError, ValueError) as e:
+            print(f"Flight prefetch failed, searching again: {e}")
+            return None
+
+    @staticmethod
+    def is_ready(trip_data: TripData) -> bool:
+        return bool(trip_data.legs) and all(
+            leg.departure is not None
+            and leg.arrival is not None
+            and leg.departure.is_valid()
+            and leg.arrival.is_valid()
+            for leg in trip_data.legs
+        )
+
+    @staticmethod
+    def fingerprint(trip_data: TripData) -> str:
+        def location_key(location: DepartureData | ArrivalData | None) -> list:
+            if location is None:
+                return []
+            return [
+                location.country.code,
+                location.city.city_code,
+                location.city.name,
+                location.airport.iata_code,
+            ]
+
+        legs = [
+            [
+                leg.date or (leg.departure.date if leg.departure else None),
+                location_key(leg.departure),
+                location_key(leg.arrival),
+            ]
+            for leg in trip_data.legs
+        ]
+        return hashlib.sha256(json.dumps(legs).encode()).hexdigest()
@@ -0,0 +1,96 @@
+import math
+
+from pydantic import BaseModel, Field
+
+from flight_concierge.types import FlightOption, RankedFlightOption
+
+
+class FlightRankingWeights(BaseModel):
+    price: float = 0.5
+    duration: float = 0.3
+    stops: float = 0.15
+    departure_fit: float = 0.05
+    preferred_departure_hour: int | None = Field(
+        None, ge=0, le=23, description="Local hour the traveler prefers to leave at"
+    )
+
+
+class FlightRanker:
+    """Deterministic ranking of flight options before they reach the LLM.
+
+    Every option is scored on price, total duration, stops and distance from
+    the preferred departure hour. Options on the Pareto front over those
+    criteria come first, each group ordered by the weighted sum of the
+    criteria min-max normalized across all options.
+    """
+
+    def __init__(self, weights: FlightRankingWeights | None = None):
+        self.weights = weights or FlightRankingWeights()
+
+    def rank(
+        self, options: list[FlightOption], limit: int | None = None
+    ) -> list[RankedFlightOption]:
+        if not options:
+            return []
+
+        criteria = [self._criteria(option) for option in options]
+        columns = list(zip(*criteria))
+        normalized = [
+            [self._normalize(value, column) for value in column] for column in columns
+        ]
+        weights = (
+            self.weights.price,
+            self.weights.duration,
+            self.weights.stops,
+            self.weights.departure_fit,
+        )
+        scores = [
+            sum(weight * column[i] for weight, column in zip(weights, normalized))
+            for i in range(len(options))
+        ]
+        front = [
+            not any(self._dominates(other, mine) for other in criteria)
+            for mine in criteria
+        ]
+
+        ranked = sorted(range(len(options)), key=lambda i: (not front[i], scores[i]))
+        return [
+            RankedFlightOption(
+                **options[i].model_dump(),
+                score=round(scores[i], 4),
+                pareto_optimal=front[i],
+            )
+            for i in ranked[:limit]
+        ]
+
+    def _criteria(self, option: FlightOption) -> tuple[float, float, float, float]:
+        return (
+            option.price if option.price is not None else math.inf,
+            option.total_duration if option.total_duration is not None else math.inf,
+            option.stops,
+            self._departure_misfit(option),
+        )
+
+    def _departure_misfit(self, option: FlightOption) -> float:
+        preferred = self.weights.preferred_departure_hour
+        if preferred is None or not option.segments:
+            return 0
+        departure_time = option.segments[0].departure_time or ""
+        try:
+            hour, minute = map(int, departure_time.split(" ")[-1].split(":"))
+        except ValueError:
+            return math.inf
+        difference = abs(hour + minute / 60 - preferred)
+        return min(difference, 24 - difference)
+
+    @staticmethod
+    def _normalize(value: float, column: tuple[float, ...]) -> float:
+        finite = [v for v in column if v != math.inf]
+        if value == math.inf:
+            return 1.0
+        low, high = min(finite), max(finite)
+        return 0.0 if high == low else (value - low) / (high - low)
+
+    @staticmethod
+    def _dominates(a: tuple, b: tuple) -> bool:
+        return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
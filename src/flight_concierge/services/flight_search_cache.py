@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from pathlib import Path
+
+from flight_concierge.services.sqlite_cache import SqliteCache
+
+DEFAULT_TTL_MINUTES = 30
+
+
+class FlightSearchCache(SqliteCache):
+    """Persistent, TTL-keyed cache of Google Flights (SerpAPI) results.
+
+    Results are stored in SQLite keyed on the normalized request params, so
+    repeated searches across sessions and processes are served from disk while
+    fresh. Concurrent identical requests in one process are coalesced into a
+    single upstream call.
+    """
+
+    file_name = "flight_search_cache.sqlite"
+    schema = """CREATE TABLE IF NOT EXISTS flight_searches (
+        key TEXT PRIMARY KEY,
+        params TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        results TEXT NOT NULL
+    )"""
+
+    def __init__(self, path: Path | None = None, ttl_seconds: float | None = None):
+        if ttl_seconds is None:
+            ttl_seconds = (
+                float(os.getenv("FLIGHT_SEARCH_CACHE_TTL_MINUTES", DEFAULT_TTL_MINUTES))
+                * 60
+            )
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future] = {}
+        super().__init__(path)
+
+    @property
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced}
+
+    def get_or_fetch(self, params: dict, fetch: Callable[[], dict]) -> dict:
+        """Return cached results for `params`, or call `fetch` once and store them.
+
+        `params` must not contain secrets: it is persisted alongside the results.
+        Results carrying an `error` key are returned but never cached.
+        """
+        key = self._key(params)
+
+        cached = self._read(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            return cached
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            # A leader that finished just before we registered may have stored it
+            results = self._read(key)
+            if results is not None:
+                future.set_result(results)
+                return results
+
+            results = fetch()
+            if "error" not in results:
+                self._write(key, params, results)
+            future.set_result(results)
+            return results
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _read(self, key: str) -> dict | None:
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT results FROM flight_searches WHERE key = ? AND fetched_at >= ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write(self, key: str, params: dict, results: dict):
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO flight_searches VALUES (?, ?, ?, ?)",
+                (
+                    key,
+                    json.dumps(params, sort_keys=True),
+                    time.time(),
+                    json.dumps(results),
+                ),
+            )
+
+    @staticmethod
+    def _key(params: dict) -> str:
+        normalized = {
+            name: value.strip().upper() if isinstance(value, str) else value
+            for name, value in params.items()
+            if value is not None
+        }
+        return hashlib.sha256(
+            json.dumps(normalized, sort_keys=True).encode()
+        ).hexdigest()
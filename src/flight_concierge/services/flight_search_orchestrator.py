@@ -0,0 +1,242 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from itertools import product
+from typing import ClassVar
+
+from flight_concierge.services.flight_ranker import FlightRanker
+from flight_concierge.services.google_flights_service import GoogleFlightsService
+from flight_concierge.stores import CityAirportsStore, CountriesStore
+from flight_concierge.types import (
+    ArrivalData,
+    DepartureData,
+    FlightOption,
+    LegFlightOptions,
+    PriceCalendar,
+    TripData,
+)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_TIMEOUT_SECONDS = 20
+DEFAULT_CURRENCY = "USD"
+
+
+class FlightSearchOrchestrator:
+    """Fan a trip out into concurrent one-way searches and merge them per leg.
+
+    Every leg is expanded into all departure x arrival airport pairs (the
+    chosen airport plus the other eligible airports of its city) and all pairs
+    of all legs are searched at once on a bounded thread pool, so wall-clock
+    time is that of the slowest search rather than the sum. Results of a leg
+    are merged and ranked together by `FlightRanker`.
+
+    The pool is shared by every orchestrator in the process, so concurrent
+    flows queue for the same `DEFAULT_MAX_WORKERS` threads.
+    """
+
+    _executor: ClassVar[ThreadPoolExecutor | None] = None
+    _executor_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        flights_service: GoogleFlightsService | None = None,
+        ranker: FlightRanker | None = None,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    ):
+        self.flights_service = flights_service or GoogleFlightsService(
+            timeout_seconds=timeout_seconds
+        )
+        self.ranker = ranker or FlightRanker()
+        self.timeout_seconds = timeout_seconds
+
+    @classmethod
+    def _shared_executor(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=DEFAULT_MAX_WORKERS, thread_name_prefix="flight-search"
+                )
+            return cls._executor
+
+    def search(
+        self, trip_data: TripData, limit_per_leg: int = 5
+    ) -> list[LegFlightOptions]:
+        currency = self._currency(trip_data)
+        legs: list[LegFlightOptions] = []
+        searches = []
+        for index, leg in enumerate(trip_data.legs):
+            if leg.departure is None or leg.arrival is None:
+                continue
+            leg_date = leg.date or leg.departure.date
+            legs.append(
+                LegFlightOptions(
+                    leg=index,
+                    departure_city=leg.departure.city.name,
+                    arrival_city=leg.arrival.city.name,
+                    date=leg_date,
+                )
+            )
+            if leg_date is None:
+                legs[-1].errors.append("Missing departure date")
+                continue
+            for departure_id, arrival_id in product(
+                self._airports(leg.departure), self._airports(leg.arrival)
+            ):
+                if departure_id != arrival_id:
+                    searches.append((len(legs) - 1, departure_id, arrival_id, leg_date))
+
+        options: list[list[FlightOption]] = [[] for _ in legs]
+        outcomes = self._search_concurrently(
+            [
+                dict(
+                    departure_id=departure_id,
+                    arrival_id=arrival_id,
+                    currency=currency,
+                    trip_type="one-way",
+                    outbound_date=leg_date,
+                )
+                for _, departure_id, arrival_id, leg_date in searches
+            ]
+        )
+        for (position, departure_id, arrival_id, _), outcome in zip(searches, outcomes):
+            if isinstance(outcome, Exception):
+                legs[position].errors.append(f"{departure_id}->{arrival_id}: {outcome}")
+            else:
+                options[position].extend(outcome)
+
+        for leg, leg_options in zip(legs, options):
+            leg.options = self.ranker.rank(leg_options, limit=limit_per_leg)
+        return legs
+
+    def search_calendar(
+        self,
+        departure_id: str,
+        arrival_id: str,
+        currency: str,
+        outbound_date: str,
+        return_date: str | None = None,
+        flex_days: int = 2,
+    ) -> PriceCalendar:
+        """Cheapest price for every date (or date pair) within `flex_days` of
+        the requested ones, searched concurrently. Cells already searched within
+        the flight search cache TTL are served from it."""
+        outbound = date.fromisoformat(outbound_date)
+        offsets = range(-flex_days, flex_days + 1)
+        outbound_dates = [(outbound + timedelta(days=o)).isoformat() for o in offsets]
+        return_dates = []
+        if return_date:
+            returning = date.fromisoformat(return_date)
+            return_dates = [
+                (returning + timedelta(days=o)).isoformat() for o in offsets
+            ]
+
+        cells = [
+            (row, column, outbound_day, return_day)
+            for row, outbound_day in enumerate(outbound_dates)
+            for column, return_day in enumerate(return_dates or [None])
+            if return_day is None or return_day >= outbound_day
+        ]
+        outcomes = self._search_concurrently(
+            [
+                dict(
+                    departure_id=departure_id,
+                    arrival_id=arrival_id,
+                    currency=currency,
+                    trip_type="round-trip" if return_day else "one-way",
+                    outbound_date=outbound_day,
+                    return_date=return_day,
+                )
+                for _, _, outbound_day, return_day in cells
+            ]
+        )
+
+        prices: list[list[float | None]] = [
+            [None] * max(len(return_dates), 1) for _ in outbound_dates
+        ]
+        for (row, column, _, _), outcome in zip(cells, outcomes):
+            if not isinstance(outcome, Exception):
+                known = [option.price for option in outcome if option.price is not None]
+                prices[row][column] = min(known) if known else None
+
+        return PriceCalendar(
+            departure_id=departure_id,
+            arrival_id=arrival_id,
+            currency=currency,
+            outbound_dates=outbound_dates,
+            return_dates=return_dates,
+            prices=prices,
+        )
+
+    def _search_concurrently(
+        self, searches: list[dict]
+    ) -> list[list[FlightOption] | Exception]:
+        """Run `GoogleFlightsService.search` for every kwargs dict on the shared
+        pool; failed searches, and searches still running `timeout_seconds`
+        after they started, come back as exceptions, in order. Time spent
+        queued for a worker does not count against a search."""
+        started_at: dict[int, float] = {}
+
+        def search(position: int, kwargs: dict) -> list[FlightOption]:
+            started_at[position] = time.monotonic()
+            return self.flights_service.search(**kwargs)
+
+        executor = self._shared_executor()
+        pending = {
+            position: executor.submit(search, position, kwargs)
+            for position, kwargs in enumerate(searches)
+        }
+        outcomes: list[list[FlightOption] | Exception] = [[] for _ in searches]
+        while pending:
+            # A search not started yet cannot time out before now + timeout
+            now = time.monotonic()
+            earliest_start = min(
+                (started_at[p] for p in pending if p in started_at), default=now
+            )
+            wait(
+                pending.values(),
+                timeout=max(earliest_start + self.timeout_seconds - now, 0),
+                return_when=FIRST_COMPLETED,
+            )
+
+            now = time.monotonic()
+            for position, future in list(pending.items()):
+                if future.done():
+                    outcomes[position] = future.exception() or future.result()
+                elif (
+                    position in started_at
+                    and now - started_at[position] >= self.timeout_seconds
+                ):
+                    outcomes[position] = TimeoutError("timed out")
+                else:
+                    continue
+                del pending[position]
+        return outcomes
+
+    @staticmethod
+    def _airports(location: DepartureData | ArrivalData) -> list[str]:
+        """The chosen airport first, then the other eligible airports of the city."""
+        airports = [location.airport.iata_code] if location.airport.iata_code else []
+        if location.city.city_code:
+            city_airports = CityAirportsStore.shared().airports_for(
+                location.city.city_code
+            )
+            airports.extend(airport["iata_code"] for airport in city_airports or [])
+        return list(dict.fromkeys(airports))
+
+    @staticmethod
+    def _currency(trip_data: TripData) -> str:
+        """Currency of the country the trip starts in, when the data knows it."""
+        default = os.getenv("FLIGHT_SEARCH_CURRENCY", DEFAULT_CURRENCY)
+        first_leg = trip_data.legs[0] if trip_data.legs else None
+        if first_leg is None or first_leg.departure is None:
+            return default
+        country_code = first_leg.departure.country.code
+        if not country_code:
+            return default
+        try:
+            countries = CountriesStore.shared().find_by_code("code", country_code, 1)
+        except FileNotFoundError:
+            return default
+        return (countries[0].get("currency") if countries else None) or default
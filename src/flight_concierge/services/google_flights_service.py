@@ -0,0 +1,56 @@
+import os
+
+from serpapi import GoogleSearch
+
+from flight_concierge.services.flight_search_cache import FlightSearchCache
+from flight_concierge.types import FlightOption
+
+
+class FlightSearchError(Exception):
+    """Raised when Google Flights (SerpAPI) answers a search with an error."""
+
+
+class GoogleFlightsService:
+    def __init__(self, timeout_seconds: float | None = None):
+        self.timeout_seconds = timeout_seconds
+
+    def search(
+        self,
+        departure_id: str,
+        arrival_id: str,
+        currency: str,
+        trip_type: str,
+        outbound_date: str,
+        return_date: str | None = None,
+    ) -> list[FlightOption]:
+        """Search Google Flights, best flights first, then the other flights."""
+        params = {
+            "engine": "google_flights",
+            "departure_id": departure_id,
+            "arrival_id": arrival_id,
+            "currency": currency,
+            "outbound_date": outbound_date,
+            "type": "1" if trip_type == "round-trip" else "2",
+        }
+        if trip_type == "round-trip" and return_date:
+            params["return_date"] = return_date
+
+        results = FlightSearchCache.shared().get_or_fetch(
+            params, lambda: self._fetch(params)
+        )
+
+        if "error" in results:
+            raise FlightSearchError(results["error"])
+
+        return [
+            FlightOption.from_serpapi(option)
+            for option in results.get("best_flights", [])
+            + results.get("other_flights", [])
+        ]
+
+    def _fetch(self, params: dict) -> dict:
+        search = GoogleSearch({**params, "api_key": os.getenv("SERPAPI_API_KEY")})
+        if self.timeout_seconds is not None:
+            # Passed to every HTTP request the client makes
+            search.timeout = self.timeout_seconds
+        return search.get_dict()
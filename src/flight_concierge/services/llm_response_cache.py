@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from flight_concierge.services.sqlite_cache import SqliteCache
+
+DEFAULT_TTL_HOURS = 24
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def llm_response_cache_enabled() -> bool:
+    return os.getenv("LLM_RESPONSE_CACHE", "false").lower() == "true"
+
+
+class LLMResponseCache(SqliteCache):
+    """Persistent LRU + TTL cache of structured LLM responses.
+
+    Entries are stored in SQLite keyed on the hashed request params (method,
+    normalized prompt, model, response schema), expire after `ttl_seconds`
+    and, past `max_entries`, the least recently used ones are evicted. Every
+    entry remembers how long the original call took, so `stats` reports the
+    time saved by hits.
+    """
+
+    file_name = "llm_response_cache.sqlite"
+    schema = """CREATE TABLE IF NOT EXISTS llm_responses (
+        key TEXT PRIMARY KEY,
+        method TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_used_at REAL NOT NULL,
+        latency_seconds REAL NOT NULL,
+        response TEXT NOT NULL
+    )"""
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ):
+        if ttl_seconds is None:
+            ttl_seconds = (
+                float(os.getenv("LLM_RESPONSE_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS))
+                * 3600
+            )
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries or int(
+            os.getenv("LLM_RESPONSE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+        )
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+        super().__init__(path)
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 2),
+        }
+
+    def get(self, params: dict) -> str | None:
+        """The cached response for `params` if still fresh, refreshing its
+        recency; counts a hit or a miss."""
+        key = self._key(params)
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT response, latency_seconds FROM llm_responses "
+                "WHERE key = ? AND created_at >= ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE llm_responses SET last_used_at = ? WHERE key = ?",
+                    (now, key),
+                )
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.saved_seconds += row[1]
+        return row[0]
+
+    def put(self, params: dict, response: str, latency_seconds: float):
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self._key(params),
+                    params.get("method", ""),
+                    now,
+                    now,
+                    latency_seconds,
+                    response,
+                ),
+            )
+            connection.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?",
+                (now - self.ttl_seconds,),
+            )
+            connection.execute(
+                """DELETE FROM llm_responses WHERE key IN (
+                    SELECT key FROM llm_responses
+                    ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,),
+            )
+
+    @staticmethod
+    def _key(params: dict) -> str:
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
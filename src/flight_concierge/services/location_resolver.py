@@ -0,0 +1,196 @@
+import os
+import re
+from typing import TypeVar
+
+from flight_concierge.stores import (
+    AirportsStore,
+    CitiesStore,
+    CityAirportsStore,
+    CountriesStore,
+    fold,
+)
+from flight_concierge.types import Airport, ArrivalData, City, Country, DepartureData
+
+# Prepositions (en/pt/es, accent-folded) that introduce each end of a trip
+DEPARTURE_MARKERS = {"from", "de", "do", "da", "desde", "del"}
+ARRIVAL_MARKERS = {"to", "para", "pra", "a", "ao", "ate", "hacia", "into"}
+# Words that follow a preposition without naming a place ("10 de maio", "to the")
+MONTHS = {
+    *("january", "february", "march", "april", "may", "june", "july"),
+    *("august", "september", "october", "november", "december"),
+    *("janeiro", "fevereiro", "marco", "abril", "maio", "junho", "julho"),
+    *("agosto", "setembro", "outubro", "novembro", "dezembro"),
+    *("enero", "febrero", "mayo", "junio", "julio", "septiembre", "octubre"),
+    *("noviembre", "diciembre"),
+}
+STOP_WORDS = {
+    *("the", "a", "an", "my", "our", "this", "next", "here", "there", "home"),
+    *("o", "os", "as", "um", "uma", "meu", "minha", "aqui", "casa", "hoje"),
+    *("el", "los", "la", "las", "un", "una", "mi", "manana", "hoy"),
+}
+# Uppercase abbreviations that happen to be IATA codes too (USA is Concord, NC)
+NOT_CODES = {"USA", "EUA", "UAE", "EAU"}
+MAX_NAME_WORDS = 4
+# A city name shared by several cities is only trusted when the most populous
+# one is at least this many times bigger than the next
+POPULATION_DOMINANCE = 10
+
+_WORD = re.compile(r"[^\W\d_]+(?:['-][^\W\d_]+)*")
+_IATA_CODE = re.compile(r"[A-Z]{3}")
+
+LocationData = TypeVar("LocationData", DepartureData, ArrivalData)
+Match = tuple[dict, dict, bool]
+
+
+def location_fast_path_enabled() -> bool:
+    return os.getenv("LOCATION_FAST_PATH", "false").lower() == "true"
+
+
+class LocationResolver:
+    """Resolve the departure and arrival of a message against the local
+    indexes, without the LLM.
+
+    Candidates are the words following a departure ("from", "de", "desde") or
+    arrival ("to", "para", "hacia") preposition, unless they are a month or a
+    stop-word: an uppercase IATA airport or city code, or the longest run of
+    up to `MAX_NAME_WORDS` words that is exactly a city name. An end of the
+    trip is resolved only when every candidate agrees on one city with known
+    airports, and, unless it was given as a code, when the other end resolves
+    to another city too; otherwise the caller should fall back to the agent.
+    Dates are left unset.
+    """
+
+    def resolve_departure(self, text: str) -> DepartureData | None:
+        return self._resolve(text, DEPARTURE_MARKERS, ARRIVAL_MARKERS, DepartureData)
+
+    def resolve_arrival(self, text: str) -> ArrivalData | None:
+        return self._resolve(text, ARRIVAL_MARKERS, DEPARTURE_MARKERS, ArrivalData)
+
+    def _resolve(
+        self,
+        text: str,
+        markers: set[str],
+        other_markers: set[str],
+        data_class: type[LocationData],
+    ) -> LocationData | None:
+        words = _WORD.findall(text)
+        # Codes are unreliable when the whole message is shouted
+        codes_allowed = not text.isupper()
+        try:
+            match = self._match(words, markers, codes_allowed)
+            if match is None:
+                return None
+            city, airport, by_code = match
+            if not by_code:
+                # A lone "de <name>" is too often not a place: want the other end too
+                other = self._match(words, other_markers, codes_allowed)
+                if other is None or other[0]["city_code"] == city["city_code"]:
+                    return None
+        except FileNotFoundError:
+            return None
+
+        return self._location(data_class, city, airport)
+
+    def _match(
+        self, words: list[str], markers: set[str], codes_allowed: bool
+    ) -> Match | None:
+        """The city all candidates after `markers` agree on, if exactly one."""
+        resolved: dict[str, Match] = {}
+        for position, word in enumerate(words):
+            if fold(word) not in markers:
+                continue
+            match = self._resolve_candidate(words[position + 1 :], codes_allowed)
+            if match is not None:
+                resolved[match[0]["city_code"]] = match
+
+        if len(resolved) != 1:
+            return None
+        return next(iter(resolved.values()))
+
+    def _resolve_candidate(self, words: list[str], codes_allowed: bool) -> Match | None:
+        if not words or fold(words[0]) in MONTHS | STOP_WORDS:
+            return None
+        if (
+            codes_allowed
+            and _IATA_CODE.fullmatch(words[0])
+            and words[0] not in NOT_CODES
+        ):
+            match = self._resolve_code(words[0])
+            if match is not None:
+                return (*match, True)
+
+        for length in range(min(MAX_NAME_WORDS, len(words)), 0, -1):
+            name = " ".join(words[:length])
+            if len(name) < 3:
+                continue
+            city = self._city_named(name)
+            if city is not None:
+                airports = CityAirportsStore.shared().airports_for(city["city_code"])
+                return (city, airports[0], False) if airports else None
+        return None
+
+    def _resolve_code(self, code: str) -> tuple[dict, dict] | None:
+        """An airport IATA code, or a city (metropolitan area) code."""
+        airports = [
+            airport
+            for airport in AirportsStore.shared().find_by_code("iata_code", code)
+            if AirportsStore.is_eligible(airport)
+        ]
+        if len(airports) == 1 and airports[0].get("city_code"):
+            cities = CitiesStore.shared().find_by_code(
+                "city_code", airports[0]["city_code"], 1
+            )
+            return (cities[0], airports[0]) if cities else None
+
+        cities = CitiesStore.shared().find_by_code("city_code", code, 1)
+        if cities:
+            airports = CityAirportsStore.shared().airports_for(code)
+            return (cities[0], airports[0]) if airports else None
+        return None
+
+    @staticmethod
+    def _city_named(name: str) -> dict | None:
+        """The city whose name is exactly `name`, if that is unambiguous."""
+        folded = fold(name)
+        cities = [
+            city
+            for city in CitiesStore.shared().search_by_name(name, limit=5)
+            if city.get("city_code") and fold(city.get("name") or "") == folded
+        ]
+        if not cities:
+            return None
+        if len(cities) > 1:
+            first, second = (city.get("population") or 0 for city in cities[:2])
+            if first < POPULATION_DOMINANCE * max(second, 1):
+                return None
+        return cities[0]
+
+    @staticmethod
+    def _location(
+        data_class: type[LocationData], city: dict, airport: dict
+    ) -> LocationData | None:
+        countries = CountriesStore.shared().find_by_code(
+            "code", city.get("country_code") or "", 1
+        )
+        if not countries:
+            return None
+        return data_class(
+            country=Country(name=countries[0].get("name"), code=countries[0]["code"]),
+            city=City(
+                name=city.get("name"),
+                city_code=city["city_code"],
+                lat=city.get("lat"),
+                lng=city.get("lng"),
+                country_code=city.get("country_code"),
+            ),
+            airport=Airport(
+                name=airport.get("name"),
+                iata_code=airport.get("iata_code"),
+                icao_code=airport.get("icao_code"),
+                city=city.get("name"),
+                city_code=city["city_code"],
+                lat=airport.get("lat"),
+                lng=airport.get("lng"),
+                country_code=city.get("country_code"),
+            ),
+        )
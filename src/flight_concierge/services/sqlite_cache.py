@@ -0,0 +1,49 @@
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ClassVar, TypeVar
+
+Cache = TypeVar("Cache", bound="SqliteCache")
+
+
+class SqliteCache:
+    """Base of the caches persisted in a SQLite file of the `db/` folder.
+
+    Subclasses name their `file_name` and the `schema` of their table. The
+    database runs in WAL mode so processes sharing the file read while one of
+    them writes; every operation opens its own short-lived connection, so an
+    instance can be used from any thread. Use `shared()` for the process-wide
+    instance.
+    """
+
+    file_name: ClassVar[str]
+    schema: ClassVar[str]
+
+    _instance: ClassVar["SqliteCache | None"] = None
+    _instance_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path | None = None):
+        project_root = Path(__file__).parent.parent.parent.parent
+        self.path = path or project_root / "db" / self.file_name
+        self.path.parent.mkdir(exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(self.schema)
+
+    @classmethod
+    def shared(cls: type[Cache]) -> Cache:
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
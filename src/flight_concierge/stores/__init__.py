@@ -0,0 +1,29 @@
+from .airports_store import AirportsStore
+from .cities_store import CitiesStore
+from .city_airports_store import CityAirportsStore, build_city_airports
+from .compiled_reference import (
+    CompiledReference,
+    compile_reference_database,
+    compiled_reference_enabled,
+)
+from .countries_store import CountriesStore
+from .json_data_store import JsonDataStore
+from .json_stream import JsonArrayWriter, iter_json_array, iter_json_file
+from .name_index import NameIndex, fold
+
+__all__ = [
+    "AirportsStore",
+    "CitiesStore",
+    "CityAirportsStore",
+    "CompiledReference",
+    "CountriesStore",
+    "JsonArrayWriter",
+    "JsonDataStore",
+    "NameIndex",
+    "build_city_airports",
+    "compile_reference_database",
+    "compiled_reference_enabled",
+    "fold",
+    "iter_json_array",
+    "iter_json_file",
+]
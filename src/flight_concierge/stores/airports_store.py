@@ -0,0 +1,80 @@
+from typing import Any
+
+from .geo_grid import GeoGrid
+from .json_data_store import JsonDataStore
+
+HELIPORT_MARKERS = ("heliport", "helipad", "heliponto", "helipuerto")
+
+
+class AirportsStore(JsonDataStore):
+    file_name = "airports.json"
+    label = "Airports"
+    code_fields = ("iata_code", "icao_code", "city_code")
+    rank_field = "popularity"
+    compact_fields = (
+        "name",
+        "iata_code",
+        "icao_code",
+        "city",
+        "city_code",
+        "lat",
+        "lng",
+        "country_code",
+        "popularity",
+    )
+
+    def nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float = 30,
+        min_popularity: float = 1,
+        limit: int | None = None,
+        use_compiled: bool = True,
+    ) -> list[tuple[dict, float]]:
+        """Return eligible `(airport, distance_km)` pairs within the radius, nearest first.
+
+        Tables derived from the airports pass `use_compiled=False`: the compiled
+        file may still hold the previous snapshot while it is being rebuilt.
+        """
+        compiled = self._compiled() if use_compiled else None
+        if compiled is not None:
+            candidates = compiled.within(self.table, lat, lng, radius_km)
+        else:
+            rows, indexes = self._snapshot()
+            candidates = (
+                (rows[position], distance)
+                for position, distance in indexes["geo"].within(lat, lng, radius_km)
+            )
+
+        matches = []
+        for airport, distance in candidates:
+            if self.is_eligible(airport, min_popularity):
+                matches.append((airport, distance))
+                if limit is not None and len(matches) == limit:
+                    break
+        return matches
+
+    @staticmethod
+    def is_eligible(airport: dict, min_popularity: float = 1) -> bool:
+        """Whether the airport is worth suggesting: has an IATA code, is not a
+        heliport and, when popularity is reported, is not below the threshold."""
+        if not airport.get("iata_code"):
+            return False
+        name = (airport.get("name") or "").lower()
+        if any(marker in name for marker in HELIPORT_MARKERS):
+            return False
+        popularity = airport.get("popularity")
+        return popularity is None or popularity >= min_popularity
+
+    def _build_indexes(self, rows: list[dict]) -> dict[str, Any]:
+        indexes = super()._build_indexes(rows)
+        indexes["geo"] = GeoGrid(
+            [
+                (row["lat"], row["lng"])
+                if row.get("lat") is not None and row.get("lng") is not None
+                else None
+                for row in rows
+            ]
+        )
+        return indexes
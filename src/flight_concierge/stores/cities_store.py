@@ -0,0 +1,9 @@
+from .json_data_store import JsonDataStore
+
+
+class CitiesStore(JsonDataStore):
+    file_name = "cities.json"
+    label = "Cities"
+    code_fields = ("city_code",)
+    rank_field = "population"
+    compact_fields = ("name", "city_code", "lat", "lng", "country_code", "population")
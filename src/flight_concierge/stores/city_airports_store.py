@@ -0,0 +1,62 @@
+from .airports_store import AirportsStore
+from .json_data_store import JsonDataStore
+
+CITY_AIRPORTS_RADIUS_KM = 30
+
+
+class CityAirportsStore(JsonDataStore):
+    """Derived city -> eligible airports join table, built at cache time."""
+
+    file_name = "city_airports.json"
+    label = "City airports"
+    code_fields = ("city_code",)
+    name_field = None
+
+    def airports_for(self, city_code: str) -> list[dict] | None:
+        """Ranked airports for the city, or None if the join table is not built."""
+        try:
+            matches = self.find_by_code("city_code", city_code)
+        except FileNotFoundError:
+            return None
+        return matches[0]["airports"] if matches else []
+
+
+def build_city_airports(
+    cities: list[dict],
+    airports: AirportsStore,
+    radius_km: float = CITY_AIRPORTS_RADIUS_KM,
+) -> list[dict]:
+    """Attach to every city the eligible airports within `radius_km` of it,
+    ranked by popularity and then distance. Airports are read from the JSON
+    file, never from a compiled database that may predate it."""
+    rows = []
+    for city in cities:
+        city_code = city.get("city_code")
+        if not city_code or city.get("lat") is None or city.get("lng") is None:
+            continue
+
+        matches = airports.nearby(
+            city["lat"], city["lng"], radius_km, use_compiled=False
+        )
+        ranked = sorted(
+            matches,
+            key=lambda match: (-(match[0].get("popularity") or 0), match[1]),
+        )
+        rows.append(
+            {
+                "city_code": city_code,
+                "airports": [
+                    {
+                        "name": airport.get("name"),
+                        "iata_code": airport["iata_code"],
+                        "icao_code": airport.get("icao_code"),
+                        "lat": airport.get("lat"),
+                        "lng": airport.get("lng"),
+                        "distance_km": round(distance, 1),
+                        "popularity": airport.get("popularity"),
+                    }
+                    for airport, distance in ranked
+                ],
+            }
+        )
+    return rows
@@ -0,0 +1,203 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import ClassVar
+
+from .geo_grid import bounding_box, haversine_km
+from .json_stream import iter_json_file
+from .name_index import fold
+
+COMPILED_FILE_NAME = "reference.sqlite"
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def compiled_reference_enabled() -> bool:
+    return os.getenv("COMPILE_REFERENCE_DB", "false").lower() == "true"
+
+
+def compile_reference_database(db_folder: Path, stores: list) -> Path:
+    """Compile the cached JSON files of `stores` into one SQLite database.
+
+    Every dataset becomes a table holding each row as JSON plus the columns
+    needed to answer lookups without decoding it: lowercased codes, the
+    folded name (with an FTS5 trigram index for substring search), the rank
+    field and coordinates. The file is written next to the JSON cache and
+    swapped in atomically.
+    """
+    target = db_folder / COMPILED_FILE_NAME
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+
+    connection = sqlite3.connect(tmp)
+    try:
+        for store in stores:
+            _compile_table(connection, store)
+        connection.commit()
+    finally:
+        connection.close()
+
+    os.replace(tmp, target)
+    return target
+
+
+def _compile_table(connection: sqlite3.Connection, store):
+    table = Path(store.file_name).stem
+    code_columns = [f"{field}_key" for field in store.code_fields]
+    connection.execute(
+        f"""CREATE TABLE {table} (
+            position INTEGER PRIMARY KEY,
+            data TEXT NOT NULL,
+            name_folded TEXT,
+            rank REAL NOT NULL,
+            lat REAL,
+            lng REAL
+            {"".join(f", {column} TEXT" for column in code_columns)}
+        )"""
+    )
+
+    connection.executemany(
+        f"""INSERT INTO {table}
+            (position, data, name_folded, rank, lat, lng
+            {"".join(f", {column}" for column in code_columns)})
+            VALUES (?, ?, ?, ?, ?, ?{", ?" * len(code_columns)})""",
+        (
+            (
+                position,
+                json.dumps(row),
+                fold(row[store.name_field])
+                if store.name_field and row.get(store.name_field)
+                else None,
+                (row.get(store.rank_field) or 0) if store.rank_field else 0,
+                row.get("lat"),
+                row.get("lng"),
+                *(
+                    row[field].lower() if row.get(field) else None
+                    for field in store.code_fields
+                ),
+            )
+            for position, row in enumerate(iter_json_file(store.path))
+        ),
+    )
+
+    for column in code_columns:
+        connection.execute(
+            f"CREATE INDEX {table}_{column} ON {table} ({column}, rank DESC, position)"
+        )
+    connection.execute(f"CREATE INDEX {table}_lat_lng ON {table} (lat, lng)")
+    if store.name_field:
+        connection.execute(
+            f"""CREATE VIRTUAL TABLE {table}_names
+                USING fts5(name_folded, content='{table}', content_rowid='position',
+                tokenize='trigram')"""
+        )
+        connection.execute(
+            f"INSERT INTO {table}_names(rowid, name_folded) "
+            f"SELECT position, name_folded FROM {table} WHERE name_folded IS NOT NULL"
+        )
+
+
+class CompiledReference:
+    """Read-only, memory-mapped view over the compiled reference database.
+
+    Connections are opened per thread in read-only mode with `mmap_size` set,
+    so every worker process shares one page-cache copy of the file and a cold
+    start is an open, not a parse.
+    """
+
+    _instances: ClassVar[dict[Path, "CompiledReference"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+
+    @classmethod
+    def shared(cls, path: Path) -> "CompiledReference":
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def is_usable(self) -> bool:
+        """Whether lookups can be answered from the compiled file.
+
+        Only with compilation enabled: the service then recompiles after every
+        refresh, so a compiled file older than the JSON cache is the previous
+        snapshot still being served. Otherwise a leftover file is ignored.
+        """
+        return compiled_reference_enabled() and self.path.exists()
+
+    def _connection(self) -> sqlite3.Connection:
+        # A refresh replaces the file; reconnect so we stop reading the old inode
+        mtime = self.path.stat().st_mtime_ns
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.mtime != mtime:
+            connection.close()
+            connection = None
+
+        if connection is None:
+            connection = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+            )
+            connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            self._local.connection = connection
+            self._local.mtime = mtime
+        return connection
+
+    def find_by_code(
+        self, table: str, field: str, code: str, limit: int | None = None
+    ) -> list[dict]:
+        cursor = self._connection().execute(
+            f"SELECT data FROM {table} WHERE {field}_key = ? "
+            f"ORDER BY rank DESC, position LIMIT ?",
+            (code.lower(), -1 if limit is None else limit),
+        )
+        return [json.loads(data) for (data,) in cursor]
+
+    def search_by_name(
+        self, table: str, query: str, limit: int | None = None
+    ) -> list[dict]:
+        query_folded = fold(query)
+        order_by = (
+            "ORDER BY CASE WHEN name_folded = :query THEN 0 "
+            "WHEN substr(name_folded, 1, length(:query)) = :query THEN 1 ELSE 2 END, "
+            "rank DESC, position LIMIT :limit"
+        )
+        if len(query_folded) < 3:
+            # FTS5 trigrams need at least three characters
+            where = "name_folded IS NOT NULL AND instr(name_folded, :query) > 0"
+        else:
+            where = (
+                f"position IN (SELECT rowid FROM {table}_names "
+                f"WHERE {table}_names MATCH :phrase)"
+            )
+        cursor = self._connection().execute(
+            f"SELECT data FROM {table} WHERE {where} {order_by}",
+            {
+                "query": query_folded,
+                "phrase": '"' + query_folded.replace('"', '""') + '"',
+                "limit": -1 if limit is None else limit,
+            },
+        )
+        return [json.loads(data) for (data,) in cursor]
+
+    def within(
+        self, table: str, lat: float, lng: float, radius_km: float
+    ) -> list[tuple[dict, float]]:
+        (south, north), lng_ranges = bounding_box(lat, lng, radius_km)
+        matches = []
+        for west, east in lng_ranges:
+            cursor = self._connection().execute(
+                f"SELECT data, lat, lng FROM {table} "
+                f"WHERE lat BETWEEN ? AND ? AND lng BETWEEN ? AND ?",
+                (south, north, west, east),
+            )
+            for data, other_lat, other_lng in cursor:
+                distance = haversine_km(lat, lng, other_lat, other_lng)
+                if distance <= radius_km:
+                    matches.append((json.loads(data), distance))
+
+        matches.sort(key=lambda match: match[1])
+        return matches
@@ -0,0 +1,9 @@
+from .json_data_store import JsonDataStore
+
+
+class CountriesStore(JsonDataStore):
+    file_name = "countries.json"
+    label = "Countries"
+    code_fields = ("code",)
+    rank_field = "population"
+    compact_fields = ("name", "code")
@@ -0,0 +1,105 @@
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 110.574
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(
+    lat: float, lng: float, radius_km: float
+) -> tuple[tuple[float, float], list[tuple[float, float]]]:
+    """Lat range and lng ranges (split at the antimeridian) covering the radius."""
+    lat_delta = radius_km / KM_PER_DEGREE_LAT
+    lat_range = (max(lat - lat_delta, -90), min(lat + lat_delta, 90))
+
+    # Longitude degrees shrink towards the poles; widen the box accordingly
+    widest_cos = math.cos(math.radians(min(abs(lat) + lat_delta, 90)))
+    if widest_cos * 180 * KM_PER_DEGREE_LAT <= radius_km:
+        return lat_range, [(-180, 180)]
+
+    lng_delta = lat_delta / widest_cos
+    west, east = lng - lng_delta, lng + lng_delta
+    if west < -180:
+        return lat_range, [(west + 360, 180), (-180, east)]
+    if east > 180:
+        return lat_range, [(west, 180), (-180, east - 360)]
+    return lat_range, [(west, east)]
+
+
+class GeoGrid:
+    """Fixed-size lat/lng cell grid for radius queries over a static point set.
+
+    Points are bucketed into `cell_degrees` square cells. A radius query only
+    visits the cells overlapping the query's bounding box and refines the
+    candidates with a haversine distance computed from precomputed radians.
+    """
+
+    def __init__(
+        self, points: list[tuple[float, float] | None], cell_degrees: float = 0.5
+    ):
+        self._cell_degrees = cell_degrees
+        self._columns = math.ceil(360 / cell_degrees)
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        self._radians: list[tuple[float, float, float] | None] = []
+
+        for position, point in enumerate(points):
+            if point is None:
+                self._radians.append(None)
+                continue
+            lat, lng = point
+            lat_rad = math.radians(lat)
+            self._radians.append((lat_rad, math.radians(lng), math.cos(lat_rad)))
+            self._cells.setdefault(self._cell(lat, lng), []).append(position)
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        row = math.floor((lat + 90) / self._cell_degrees)
+        column = math.floor((lng + 180) / self._cell_degrees) % self._columns
+        return row, column
+
+    def within(
+        self, lat: float, lng: float, radius_km: float
+    ) -> list[tuple[int, float]]:
+        """Return `(position, distance_km)` pairs within the radius, nearest first."""
+        lat_delta = radius_km / KM_PER_DEGREE_LAT
+        min_row, _ = self._cell(max(lat - lat_delta, -90), lng)
+        max_row, _ = self._cell(min(lat + lat_delta, 90), lng)
+
+        # Longitude degrees shrink towards the poles; widen the box accordingly
+        widest_cos = math.cos(math.radians(min(abs(lat) + lat_delta, 90)))
+        if widest_cos * 180 * KM_PER_DEGREE_LAT <= radius_km:
+            columns = range(self._columns)
+        else:
+            lng_delta = lat_delta / widest_cos
+            _, first_column = self._cell(lat, lng - lng_delta)
+            span = math.ceil(2 * lng_delta / self._cell_degrees) + 1
+            columns = [
+                (first_column + offset) % self._columns
+                for offset in range(min(span, self._columns))
+            ]
+
+        lat_rad = math.radians(lat)
+        lng_rad = math.radians(lng)
+        cos_lat = math.cos(lat_rad)
+        matches = []
+        for row in range(min_row, max_row + 1):
+            for column in columns:
+                for position in self._cells.get((row, column), ()):
+                    other_lat, other_lng, other_cos = self._radians[position]
+                    a = (
+                        math.sin((other_lat - lat_rad) / 2) ** 2
+                        + cos_lat * other_cos * math.sin((other_lng - lng_rad) / 2) ** 2
+                    )
+                    distance = 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+                    if distance <= radius_km:
+                        matches.append((position, distance))
+
+        matches.sort(key=lambda match: match[1])
+        return matches
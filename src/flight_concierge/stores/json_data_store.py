@@ -0,0 +1,183 @@
+import heapq
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, ClassVar
+
+from .compiled_reference import COMPILED_FILE_NAME, CompiledReference
+from .name_index import NameIndex, fold
+
+DB_FOLDER = Path(__file__).parent.parent.parent.parent / "db"
+
+
+class JsonDataStore:
+    """Process-wide, load-once view over one of the cached AirLabs JSON files.
+
+    The file is parsed on first access and only re-read when its mtime changes.
+    Rows are indexed by the lowercased values of `code_fields` so exact code
+    lookups are a dict hit instead of a scan, and by an accent-insensitive
+    `NameIndex` over `name_field` for partial name searches.
+
+    Results are ranked (exact name, then prefix, then substring, then by
+    `rank_field` descending) and can be cut to the top `limit` rows and
+    projected down to `compact_fields` before they reach the LLM context.
+
+    When a compiled reference database (see `compile_reference_database`) is
+    usable, lookups are answered from it instead and the JSON file is never
+    parsed.
+    """
+
+    file_name: ClassVar[str] = ""
+    label: ClassVar[str] = ""
+    code_fields: ClassVar[tuple[str, ...]] = ()
+    name_field: ClassVar[str | None] = "name"
+    rank_field: ClassVar[str | None] = None
+    compact_fields: ClassVar[tuple[str, ...]] = ()
+
+    _instances: ClassVar[dict[type, "JsonDataStore"]] = {}
+    _instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or DB_FOLDER / self.file_name
+        self._lock = threading.Lock()
+        self._mtime: int | None = None
+        self._data: tuple[list[dict], dict[str, Any]] = ([], {})
+
+    @classmethod
+    def shared(cls):
+        """Return the process-wide instance of this store."""
+        with cls._instances_lock:
+            if cls not in cls._instances:
+                cls._instances[cls] = cls()
+            return cls._instances[cls]
+
+    @property
+    def table(self) -> str:
+        return Path(self.file_name).stem
+
+    @property
+    def rows(self) -> list[dict]:
+        return self._snapshot()[0]
+
+    def index(self, name: str):
+        return self._snapshot()[1][name]
+
+    def _snapshot(self) -> tuple[list[dict], dict[str, Any]]:
+        self.refresh()
+        return self._data
+
+    def _compiled(self) -> CompiledReference | None:
+        compiled = CompiledReference.shared(self.path.parent / COMPILED_FILE_NAME)
+        return compiled if compiled.is_usable() else None
+
+    def refresh(self):
+        """Reload the file if it changed on disk since the last load.
+
+        While another thread is reloading, readers keep being served the
+        previous snapshot instead of waiting for the new indexes.
+        """
+        mtime = self._current_mtime()
+        if mtime == self._mtime:
+            return
+
+        if not self._lock.acquire(blocking=self._mtime is None):
+            return
+        try:
+            self._load()
+        finally:
+            self._lock.release()
+
+    @contextmanager
+    def reloading(self):
+        """Hold the reload lock while the file is being replaced, then index it.
+
+        Readers keep using the old snapshot for the whole swap, so a refresh
+        never puts a JSON parse or an index build on the request path.
+        """
+        with self._lock:
+            yield
+            self._load()
+
+    def _current_mtime(self) -> int:
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"{self.label} database not found at {self.path}. Please run the service to cache data first."
+            ) from None
+
+    def _load(self):
+        mtime = self._current_mtime()
+        if mtime == self._mtime:
+            return
+        with open(self.path, "r") as f:
+            rows = json.load(f)
+        # Swap rows and indexes together so readers never see a mix of snapshots
+        self._data = (rows, self._build_indexes(rows))
+        self._mtime = mtime
+
+    def find_by_code(
+        self, field: str, code: str, limit: int | None = None
+    ) -> list[dict]:
+        compiled = self._compiled()
+        if compiled is not None:
+            return compiled.find_by_code(self.table, field, code, limit)
+
+        matches = self.index(field).get(code.lower(), [])
+        if self.rank_field is None:
+            return matches[:limit]
+        return self._top(matches, key=lambda row: -self._rank(row), limit=limit)
+
+    def search_by_name(self, query: str, limit: int | None = None) -> list[dict]:
+        compiled = self._compiled()
+        if compiled is not None:
+            return compiled.search_by_name(self.table, query, limit)
+
+        rows, indexes = self._snapshot()
+        name_index = indexes["name"]
+        query_folded = fold(query)
+
+        def sort_key(position: int):
+            name = name_index.folded(position)
+            if name == query_folded:
+                tier = 0
+            elif name.startswith(query_folded):
+                tier = 1
+            else:
+                tier = 2
+            return (tier, -self._rank(rows[position]), position)
+
+        positions = self._top(name_index.search(query), key=sort_key, limit=limit)
+        return [rows[position] for position in positions]
+
+    def project(self, row: dict) -> dict:
+        """Keep only the `compact_fields` that are present on the row."""
+        return {
+            field: row[field]
+            for field in self.compact_fields
+            if row.get(field) is not None
+        }
+
+    def _rank(self, row: dict) -> float:
+        if self.rank_field is None:
+            return 0
+        return row.get(self.rank_field) or 0
+
+    @staticmethod
+    def _top(items: list, key, limit: int | None) -> list:
+        if limit is None:
+            return sorted(items, key=key)
+        return heapq.nsmallest(limit, items, key=key)
+
+    def _build_indexes(self, rows: list[dict]) -> dict[str, Any]:
+        indexes: dict[str, Any] = {}
+        for field in self.code_fields:
+            by_code: dict[str, list[dict]] = {}
+            for row in rows:
+                if row.get(field):
+                    by_code.setdefault(row[field].lower(), []).append(row)
+            indexes[field] = by_code
+        if self.name_field is not None:
+            indexes["name"] = NameIndex([row.get(self.name_field) for row in rows])
+        return indexes
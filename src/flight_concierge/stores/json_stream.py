@@ -0,0 +1,114 @@
+import codecs
+import json
+import os
+import re
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+READ_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = re.compile(r"[\s,]*")
+# What may follow an array item; anything else means the item is cut short
+_ITEM_END = re.compile(r"[\s,\]]")
+
+
+def iter_json_array(
+    chunks: Iterable[bytes | str], key: str | None = None
+) -> Iterator[Any]:
+    """Yield the items of a JSON array as its text arrives in chunks.
+
+    With `key`, the array is the value of that key in a top-level object
+    (e.g. AirLabs' `{"request": ..., "response": [...]}`); otherwise the
+    document itself is the array. Only the item being decoded and the unread
+    tail of the current chunk are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    start = re.compile(rf'"{re.escape(key)}"\s*:\s*\[' if key else r"\s*\[")
+
+    def read_more() -> str | None:
+        for chunk in chunks:
+            text = text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                return text
+        return None
+
+    buffer = ""
+    while (match := start.search(buffer) if key else start.match(buffer)) is None:
+        more = read_more()
+        if more is None:
+            raise ValueError(f"No JSON array found in stream: {buffer[:200]!r}")
+        buffer += more
+
+    position = match.end()
+    exhausted = False
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+            # A number may continue in the next chunk: "1" of "12", "1" of "1.5"
+            complete = exhausted or _ITEM_END.match(buffer, end) is not None
+        except json.JSONDecodeError:
+            if exhausted:
+                raise
+            complete = False
+        if not complete:
+            more = read_more()
+            if more is None:
+                exhausted = True
+            else:
+                buffer = buffer[position:] + more
+                position = 0
+            continue
+        position = end
+        yield item
+
+
+def iter_json_file(path: Path, key: str | None = None) -> Iterator[Any]:
+    """Stream the items of a JSON array file without loading it whole."""
+    with open(path, "rb") as f:
+        yield from iter_json_array(iter(lambda: f.read(READ_CHUNK_SIZE), b""), key)
+
+
+class JsonArrayWriter:
+    """Write a JSON array one row per line to a temp file next to `target`.
+
+    Nothing is visible at `target` until `commit()` renames the finished file
+    over it; `close()` without a commit discards the temp file.
+    """
+
+    def __init__(self, target: Path):
+        self.target = target
+        self.rows = 0
+        fd, self._tmp_path = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        self._file = os.fdopen(fd, "w")
+        self._file.write("[")
+        self._committed = False
+
+    def write(self, row: Any):
+        self._file.write(",\n" if self.rows else "\n")
+        self._file.write(json.dumps(row))
+        self.rows += 1
+
+    def commit(self):
+        self._file.write("\n]\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._tmp_path, self.target)
+        self._committed = True
+
+    def close(self):
+        if not self._committed:
+            self._file.close()
+            os.unlink(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,61 @@
+import unicodedata
+
+
+def fold(text: str) -> str:
+    """Casefold and strip accents, so "São Paulo" and "sao paulo" compare equal."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+class NameIndex:
+    """Accent-insensitive substring index over a list of names.
+
+    Every folded name is split into bigrams and trigrams with posting lists of
+    row positions. A query is answered by intersecting the postings of its own
+    grams and verifying the survivors, so only a handful of names are compared
+    instead of the whole dataset.
+    """
+
+    def __init__(self, names: list[str | None]):
+        self._folded = [fold(name) if name else "" for name in names]
+        self._grams: dict[str, list[int]] = {}
+        for position, name in enumerate(self._folded):
+            grams = {name[i : i + 2] for i in range(len(name) - 1)}
+            grams.update(name[i : i + 3] for i in range(len(name) - 2))
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(position)
+
+    def folded(self, position: int) -> str:
+        return self._folded[position]
+
+    def search(self, query: str) -> list[int]:
+        """Return the positions of all names containing `query`, in row order."""
+        query_folded = fold(query)
+
+        # Too short to have a gram: scan the pre-folded names
+        if len(query_folded) < 2:
+            return [
+                position
+                for position, name in enumerate(self._folded)
+                if name and query_folded in name
+            ]
+
+        size = min(len(query_folded), 3)
+        postings = sorted(
+            (
+                self._grams.get(query_folded[i : i + size], [])
+                for i in range(len(query_folded) - size + 1)
+            ),
+            key=len,
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+
+        return sorted(
+            position
+            for position in candidates
+            if query_folded in self._folded[position]
+        )
@@ -1,11 +1,15 @@
+from .get_flight_price_calendar import GetFlightPriceCalendar
 from .get_flights_from_google_flights import GetFlightsFromGoogleFlights
 from .query_local_airports_database import QueryLocalAirportsDatabase
 from .query_local_cities_database import QueryLocalCitiesDatabase
 from .query_local_countries_database import QueryLocalCountriesDatabase
+from .query_local_nearby_airports import QueryLocalNearbyAirports
 
 __all__ = [
+    "GetFlightPriceCalendar",
     "GetFlightsFromGoogleFlights",
     "QueryLocalAirportsDatabase",
     "QueryLocalCitiesDatabase",
     "QueryLocalCountriesDatabase",
+    "QueryLocalNearbyAirports",
 ]
@@ -0,0 +1,66 @@
+from pydantic import BaseModel, Field
+
+from flight_concierge.services.flight_search_orchestrator import (
+    FlightSearchOrchestrator,
+)
+from flight_concierge.tools.threaded_tool import ThreadedTool
+
+
+class GetFlightPriceCalendarInput(BaseModel):
+    """Input schema for GetFlightPriceCalendar."""
+
+    departure_id: str = Field(
+        ...,
+        description="The IATA airport code of the departure airport (e.g. REC, GRU, etc.) REQUIRED",
+    )
+    arrival_id: str = Field(
+        ...,
+        description="The IATA airport code of the arrival airport (e.g. REC, GRU, etc.) REQUIRED",
+    )
+    currency: str = Field(
+        ...,
+        description="The currency used to pay for the flights (e.g. USD, EUR, BRL, etc.) REQUIRED",
+    )
+    outbound_date: str = Field(
+        ...,
+        description="The approximate outbound date in ISO format (YYYY-MM-DD) REQUIRED",
+    )
+    return_date: str | None = Field(
+        None,
+        description="The approximate return date in ISO format (YYYY-MM-DD). OPTIONAL (only for round-trips)",
+    )
+    flex_days: int = Field(
+        default=2,
+        ge=1,
+        le=3,
+        description="How many days before and after each date to search",
+    )
+
+
+class GetFlightPriceCalendar(ThreadedTool):
+    name: str = "Find Flight Price Calendar"
+    description: str = """Compare prices across flexible dates between two airports using Google Flights.
+    Use it when the traveler's dates are approximate (e.g. "around the 10th"). It searches every
+    outbound date (and return date, for round-trips) within `flex_days` of the given ones at once and
+    returns a compact outbound x return price matrix with the cheapest combination highlighted.
+    Use 'Find Flights' afterwards to get the flight details for the chosen dates."""
+    args_schema: type[BaseModel] = GetFlightPriceCalendarInput
+
+    def _run(
+        self,
+        departure_id: str,
+        arrival_id: str,
+        currency: str,
+        outbound_date: str,
+        return_date: str | None = None,
+        flex_days: int = 2,
+    ) -> dict:
+        calendar = FlightSearchOrchestrator().search_calendar(
+            departure_id=departure_id,
+            arrival_id=arrival_id,
+            currency=currency,
+            outbound_date=outbound_date,
+            return_date=return_date,
+            flex_days=flex_days,
+        )
+        return {**calendar.model_dump(), "cheapest": calendar.cheapest()}
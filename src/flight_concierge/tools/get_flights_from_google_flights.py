@@ -1,9 +1,16 @@
-import os
 from typing import Literal, Type
 
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
-from serpapi import GoogleSearch
+
+from flight_concierge.services.flight_ranker import (
+    FlightRanker,
+    FlightRankingWeights,
+)
+from flight_concierge.services.google_flights_service import (
+    FlightSearchError,
+    GoogleFlightsService,
+)
+from flight_concierge.tools.threaded_tool import ThreadedTool
 
 
 class GetFlightsFromGoogleFlightsInput(BaseModel):
@@ -33,14 +40,28 @@ class GetFlightsFromGoogleFlightsInput(BaseModel):
         None,
         description="The date of the return flight in ISO format (YYYY-MM-DD). OPTIONAL (only needed for round-trips)",
     )
+    max_options: int = Field(
+        default=5,
+        ge=1,
+        le=10,
+        description="Maximum number of flight options to return, best first",
+    )
+    preferred_departure_hour: int | None = Field(
+        None,
+        ge=0,
+        le=23,
+        description="Local hour (0-23) the traveler prefers to depart at, if they said so. OPTIONAL",
+    )
 
 
-class GetFlightsFromGoogleFlights(BaseTool):
+class GetFlightsFromGoogleFlights(ThreadedTool):
     name: str = "Find Flights"
     description: str = """Search for the best available flights between two airports using Google Flights.
     This tool finds flight options with pricing, schedules, and airline information for both one-way
-    and round-trip journeys. It returns the most relevant flight results including departure/arrival
-    times, duration, stops, and fare details to help users make informed travel decisions."""
+    and round-trip journeys. It returns up to `max_options` compact flight options, already ranked
+    (Pareto-optimal options on price, duration, stops and departure time first, then by score), each
+    with price, total duration (minutes), stops, carriers and the departure/arrival airport and time
+    of every segment."""
     args_schema: Type[BaseModel] = GetFlightsFromGoogleFlightsInput
 
     def _run(
@@ -51,22 +72,25 @@ class GetFlightsFromGoogleFlights(BaseTool):
         trip_type: str,
         outbound_date: str,
         return_date: str | None = None,
-    ) -> dict:
-        params = {
-            "engine": "google_flights",
-            "departure_id": departure_id,
-            "arrival_id": arrival_id,
-            "currency": currency,
-            "outbound_date": outbound_date,
-            "type": "1" if trip_type == "round-trip" else "2",
-            "api_key": os.getenv("SERPAPI_API_KEY"),
-        }
-        if trip_type == "round-trip" and return_date:
-            params["return_date"] = return_date
-
-        results = GoogleSearch(params).get_dict()
+        max_options: int = 5,
+        preferred_departure_hour: int | None = None,
+    ) -> list[dict] | dict:
+        try:
+            options = GoogleFlightsService().search(
+                departure_id=departure_id,
+                arrival_id=arrival_id,
+                currency=currency,
+                trip_type=trip_type,
+                outbound_date=outbound_date,
+                return_date=return_date,
+            )
+        except FlightSearchError as e:
+            return {"error": str(e)}
 
-        if "best_flights" in results and results["best_flights"]:
-            return results["best_flights"]
-        else:
-            return results
+        ranker = FlightRanker(
+            FlightRankingWeights(preferred_departure_hour=preferred_departure_hour)
+        )
+        return [
+            option.model_dump(exclude_none=True)
+            for option in ranker.rank(options, limit=max_options)
+        ]
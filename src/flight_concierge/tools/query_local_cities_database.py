@@ -1,10 +1,10 @@
-import json
-from pathlib import Path
 from typing import Literal, Type
 
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from flight_concierge.stores import CitiesStore, CityAirportsStore
+from flight_concierge.tools.threaded_tool import ThreadedTool
+
 
 class QueryLocalCitiesDatabaseInput(BaseModel):
     """Input schema for QueryLocalCitiesDatabase."""
@@ -14,58 +14,56 @@ class QueryLocalCitiesDatabaseInput(BaseModel):
         default="auto",
         description="Filter type: 'city_code' for city code match, 'name' for city name match, 'auto' to search both with priority on city code",
     )
+    limit: int = Field(
+        default=5,
+        ge=1,
+        le=25,
+        description="Maximum number of results to return, best matches first",
+    )
 
 
-class QueryLocalCitiesDatabase(BaseTool):
+class QueryLocalCitiesDatabase(ThreadedTool):
     name: str = "Query Local Cities Database"
     description: str = (
         "Query the local cities database for city information. "
         "Can filter by city code or city name. "
         "Prioritizes exact city code matches over name matches when using 'auto' mode. "
-        "Returns a list of city dictionaries with all fields."
+        "Name matches are partial and accent-insensitive. "
+        "Returns up to `limit` compact city dictionaries, best matches first. "
+        "Each city carries its eligible airports (within 30 km, no heliports) "
+        "ranked by popularity in `airports`, when the city airports table is available."
     )
     args_schema: Type[BaseModel] = QueryLocalCitiesDatabaseInput
 
-    def _load_cities_data(self):
-        """Load cities data from JSON file."""
-        # Get project root (assuming tool is in src/flight_concierge/tools/)
-        project_root = Path(__file__).parent.parent.parent.parent
-        cities_file = project_root / "db" / "cities.json"
-
-        if not cities_file.exists():
-            raise FileNotFoundError(
-                f"Cities database not found at {cities_file}. Please run the service to cache data first."
-            )
-
-        with open(cities_file, "r") as f:
-            return json.load(f)
+    def _with_airports(self, city: dict) -> dict:
+        airports = CityAirportsStore.shared().airports_for(city.get("city_code", ""))
+        if airports is None:
+            return city
+        return {**city, "airports": airports}
 
     def _run(
         self,
         search_query: str,
         filter_by: Literal["city_code", "name", "auto"] = "auto",
+        limit: int = 5,
     ) -> list[dict]:
-        query_lower = search_query.lower()
-        cities = self._load_cities_data()
+        cities = CitiesStore.shared()
 
         # Priority 1: Exact city code match
         if filter_by in ["city_code", "auto"]:
-            city_code_matches = [
-                city
-                for city in cities
-                if city.get("city_code") and query_lower == city["city_code"].lower()
-            ]
+            city_code_matches = cities.find_by_code("city_code", search_query, limit)
             if city_code_matches:
-                return city_code_matches
+                return [
+                    self._with_airports(cities.project(row))
+                    for row in city_code_matches
+                ]
 
-        # Priority 2: Name matches (partial allowed)
+        # Priority 2: Name matches (partial, accent-insensitive)
         if filter_by in ["name", "auto"]:
-            name_matches = [
-                city
-                for city in cities
-                if city.get("name") and query_lower in city["name"].lower()
-            ]
+            name_matches = cities.search_by_name(search_query, limit)
             if name_matches:
-                return name_matches
+                return [
+                    self._with_airports(cities.project(row)) for row in name_matches
+                ]
 
         return []
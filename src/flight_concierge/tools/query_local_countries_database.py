@@ -1,10 +1,10 @@
-import json
-from pathlib import Path
 from typing import Literal, Type
 
-from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from flight_concierge.stores import CountriesStore
+from flight_concierge.tools.threaded_tool import ThreadedTool
+
 
 class QueryLocalCountriesDatabaseInput(BaseModel):
     """Input schema for QueryLocalCountriesDatabase."""
@@ -16,58 +16,43 @@ class QueryLocalCountriesDatabaseInput(BaseModel):
         default="auto",
         description="Filter type: 'code' for country code match, 'name' for country name match, 'auto' to search both with priority on code",
     )
+    limit: int = Field(
+        default=5,
+        ge=1,
+        le=25,
+        description="Maximum number of results to return, best matches first",
+    )
 
 
-class QueryLocalCountriesDatabase(BaseTool):
+class QueryLocalCountriesDatabase(ThreadedTool):
     name: str = "Query Local Countries Database"
     description: str = (
         "Query the local countries database for country information. "
         "Can filter by country code or country name. "
         "Prioritizes exact country code matches over name matches when using 'auto' mode. "
-        "Returns a list of country dictionaries with all fields."
+        "Name matches are partial and accent-insensitive. "
+        "Returns up to `limit` compact country dictionaries, best matches first."
     )
     args_schema: Type[BaseModel] = QueryLocalCountriesDatabaseInput
 
-    def _load_countries_data(self):
-        """Load countries data from JSON file."""
-        # Get project root (assuming tool is in src/flight_concierge/tools/)
-        project_root = Path(__file__).parent.parent.parent.parent
-        countries_file = project_root / "db" / "countries.json"
-
-        if not countries_file.exists():
-            raise FileNotFoundError(
-                f"Countries database not found at {countries_file}. Please run the service to cache data first."
-            )
-
-        with open(countries_file, "r") as f:
-            return json.load(f)
-
     def _run(
         self,
         search_query: str,
         filter_by: Literal["code", "name", "auto"] = "auto",
+        limit: int = 5,
     ) -> list[dict]:
-        query_lower = search_query.lower()
-        countries = self._load_countries_data()
+        countries = CountriesStore.shared()
 
         # Priority 1: Exact country code match
         if filter_by in ["code", "auto"]:
-            code_matches = [
-                country
-                for country in countries
-                if country.get("code") and query_lower == country["code"].lower()
-            ]
+            code_matches = countries.find_by_code("code", search_query, limit)
             if code_matches:
-                return code_matches
+                return [countries.project(row) for row in code_matches]
 
-        # Priority 2: Name matches (partial allowed)
+        # Priority 2: Name matches (partial, accent-insensitive)
         if filter_by in ["name", "auto"]:
-            name_matches = [
-                country
-                for country in countries
-                if country.get("name") and query_lower in country["name"].lower()
-            ]
+            name_matches = countries.search_by_name(search_query, limit)
             if name_matches:
-                return name_matches
+                return [countries.project(row) for row in name_matches]
 
         return []
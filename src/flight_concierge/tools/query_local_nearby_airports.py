@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+
+from flight_concierge.stores import AirportsStore
+from flight_concierge.tools.threaded_tool import ThreadedTool
+
+
+class QueryLocalNearbyAirportsInput(BaseModel):
+    """Input schema for QueryLocalNearbyAirports."""
+
+    lat: float = Field(..., description="Latitude of the point to search around")
+    lng: float = Field(..., description="Longitude of the point to search around")
+    distance_km: float = Field(
+        default=30,
+        gt=0,
+        le=200,
+        description="Search radius in kilometers",
+    )
+    limit: int = Field(
+        default=5,
+        ge=1,
+        le=25,
+        description="Maximum number of results to return, nearest first",
+    )
+
+
+class QueryLocalNearbyAirports(ThreadedTool):
+    name: str = "Query Local Nearby Airports"
+    description: str = (
+        "Find airports within a given distance of a latitude/longitude using the local airports database. "
+        "Heliports, airports without an IATA code and low popularity airports are already filtered out. "
+        "Free to use. "
+        "Returns up to `limit` compact airport dictionaries with their distance_km, nearest first."
+    )
+    args_schema: type[BaseModel] = QueryLocalNearbyAirportsInput
+
+    def _run(
+        self,
+        lat: float,
+        lng: float,
+        distance_km: float = 30,
+        limit: int = 5,
+    ) -> list[dict]:
+        airports = AirportsStore.shared()
+        return [
+            {**airports.project(airport), "distance_km": round(distance, 1)}
+            for airport, distance in airports.nearby(lat, lng, distance_km, limit=limit)
+        ]
@@ -0,0 +1,12 @@
+import asyncio
+from typing import Any
+
+from crewai.tools import BaseTool
+
+
+class ThreadedTool(BaseTool):
+    """A tool whose blocking `_run` is moved to a worker thread when awaited,
+    so async flows keep their event loop free while it runs."""
+
+    async def _arun(self, *args, **kwargs) -> Any:
+        return await asyncio.to_thread(self._run, *args, **kwargs)
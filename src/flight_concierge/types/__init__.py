@@ -1,25 +1,43 @@
 from .airport import Airport
 from .arrival_data import ArrivalData
 from .city import City
+from .conversation_summary import ConversationSummary
 from .country import Country
 from .departure_data import DepartureData
 from .flight_concierge_state import FlightConciergeState
+from .flight_option import FlightOption, FlightSegment, RankedFlightOption
 from .interaction import Interaction
 from .leg import Leg
+from .leg_flight_options import LegFlightOptions
 from .message import Message
+from .price_calendar import PriceCalendar
 from .review import Review
+from .travel_date import TravelDate
 from .trip_data import TripData
+from .trip_data_patch import TripDataChange, TripDataPatch, TripDataUpdate
+from .trip_legs import TripLegs
 
 __all__ = [
     "Airport",
     "ArrivalData",
     "City",
+    "ConversationSummary",
     "Country",
     "DepartureData",
     "FlightConciergeState",
+    "FlightOption",
+    "FlightSegment",
     "Interaction",
     "Leg",
+    "LegFlightOptions",
     "Message",
+    "PriceCalendar",
+    "RankedFlightOption",
     "Review",
+    "TravelDate",
     "TripData",
+    "TripDataChange",
+    "TripDataPatch",
+    "TripDataUpdate",
+    "TripLegs",
 ]
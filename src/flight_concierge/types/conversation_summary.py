@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+
+class ConversationSummary(BaseModel):
+    summary: str = Field(
+        description="Compact summary of the conversation so far, keeping every travel fact"
+    )
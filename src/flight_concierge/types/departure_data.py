@@ -1,10 +1,9 @@
-from datetime import date
-
 from pydantic import BaseModel, Field, field_validator
 
 from .airport import Airport
 from .city import City
 from .country import Country
+from .travel_date import TravelDate
 
 
 class DepartureData(BaseModel):
@@ -15,22 +14,7 @@ class DepartureData(BaseModel):
         None, description="The date of the departure in ISO format (YYYY-MM-DD)"
     )
 
-    @field_validator("date", mode="before")
-    @classmethod
-    def validate_date(cls, v):
-        """Validate and ensure date is in ISO format string."""
-        if v is None:
-            return v
-        if isinstance(v, date):
-            return v.isoformat()
-        if isinstance(v, str):
-            # Validate the string is a valid date format
-            try:
-                date.fromisoformat(v)
-                return v
-            except ValueError:
-                raise ValueError(f"Invalid date format: {v}. Expected YYYY-MM-DD")
-        raise ValueError(f"Date must be a string or date object, got {type(v)}")
+    validate_date = field_validator("date", mode="before")(TravelDate.parse_date)
 
     def is_valid(self) -> bool:
         return (
@@ -1,9 +1,19 @@
+import os
+
 from pydantic import BaseModel
 
 from .interaction import Interaction
 from .message import Message
 from .trip_data import TripData
 
+DEFAULT_CONVERSATION_TOKEN_BUDGET = 1500
+
+
+def conversation_token_budget() -> int:
+    return int(
+        os.getenv("CONVERSATION_TOKEN_BUDGET", DEFAULT_CONVERSATION_TOKEN_BUDGET)
+    )
+
 
 class FlightConciergeState(BaseModel):
     # inputs
@@ -13,3 +23,34 @@ class FlightConciergeState(BaseModel):
     trip_data: TripData = TripData()
     messages: list[Message] = []
     interactions: list[Interaction] = []
+
+    # context compaction: `messages[:summarized_count]` live on in the summary
+    conversation_summary: str = ""
+    summarized_count: int = 0
+
+    def context_messages(self) -> list[Message]:
+        """What the agent sees of the conversation: the rolling summary of the
+        older messages followed by every message not summarized yet."""
+        recent = self.messages[self.summarized_count :]
+        if not self.conversation_summary:
+            return recent
+        summary = Message(
+            role="system",
+            content=f"Summary of the earlier conversation: {self.conversation_summary}",
+        )
+        return [summary, *recent]
+
+    def messages_to_summarize(self, budget_tokens: int | None = None) -> list[Message]:
+        """The unsummarized messages older than the most recent ones that fit
+        in `budget_tokens` (the latest message is always kept verbatim)."""
+        if budget_tokens is None:
+            budget_tokens = conversation_token_budget()
+        recent = self.messages[self.summarized_count :]
+        kept = 0
+        used_tokens = 0
+        for message in reversed(recent):
+            used_tokens += message.estimated_tokens()
+            if kept and used_tokens > budget_tokens:
+                break
+            kept += 1
+        return recent[: len(recent) - kept]
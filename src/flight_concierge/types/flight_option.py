@@ -0,0 +1,60 @@
+from pydantic import BaseModel, Field
+
+
+class FlightSegment(BaseModel):
+    airline: str | None = None
+    flight_number: str | None = None
+    departure_airport: str | None = Field(None, description="IATA code")
+    departure_time: str | None = Field(
+        None, description="Local time (YYYY-MM-DD HH:MM)"
+    )
+    arrival_airport: str | None = Field(None, description="IATA code")
+    arrival_time: str | None = Field(None, description="Local time (YYYY-MM-DD HH:MM)")
+    duration: int | None = Field(None, description="Duration in minutes")
+
+    @classmethod
+    def from_serpapi(cls, flight: dict) -> "FlightSegment":
+        departure = flight.get("departure_airport") or {}
+        arrival = flight.get("arrival_airport") or {}
+        return cls(
+            airline=flight.get("airline"),
+            flight_number=flight.get("flight_number"),
+            departure_airport=departure.get("id"),
+            departure_time=departure.get("time"),
+            arrival_airport=arrival.get("id"),
+            arrival_time=arrival.get("time"),
+            duration=flight.get("duration"),
+        )
+
+
+class FlightOption(BaseModel):
+    price: float | None = None
+    total_duration: int | None = Field(None, description="Duration in minutes")
+    stops: int = 0
+    carriers: list[str] = []
+    segments: list[FlightSegment] = []
+
+    @classmethod
+    def from_serpapi(cls, option: dict) -> "FlightOption":
+        """Project one SerpAPI Google Flights result down to what a traveler compares."""
+        segments = [
+            FlightSegment.from_serpapi(flight) for flight in option.get("flights", [])
+        ]
+        return cls(
+            price=option.get("price"),
+            total_duration=option.get("total_duration"),
+            stops=max(len(segments) - 1, 0),
+            carriers=list(
+                dict.fromkeys(
+                    segment.airline for segment in segments if segment.airline
+                )
+            ),
+            segments=segments,
+        )
+
+
+class RankedFlightOption(FlightOption):
+    score: float = Field(description="Weighted score, lower is better")
+    pareto_optimal: bool = Field(
+        description="No other option is at least as good on every criterion and better on one"
+    )
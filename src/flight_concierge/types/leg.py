@@ -3,6 +3,15 @@ from pydantic import BaseModel, Field
 from .arrival_data import ArrivalData
 from .departure_data import DepartureData
 
+PROMPT_VIEW_FIELDS = {
+    "country": {"name", "code"},
+    "city": {"name", "city_code", "lat", "lng"},
+    "airport": {"name", "iata_code", "icao_code", "lat", "lng"},
+    "date": True,
+}
+# Codes telling that a city or airport returned by the model is the one it was shown
+IDENTITY_FIELDS = {"city": ("city_code",), "airport": ("iata_code", "icao_code")}
+
 
 class Leg(BaseModel):
     departure: DepartureData | None = None
@@ -10,3 +19,36 @@ class Leg(BaseModel):
     date: str | None = Field(
         None, description="Date of the flight leg in ISO format (YYYY-MM-DD)"
     )
+
+    def prompt_view(self) -> dict:
+        """The fields the concierge reasons about, without empty values."""
+        view = {"date": self.date}
+        for end, location in (("departure", self.departure), ("arrival", self.arrival)):
+            if location is not None:
+                view[end] = location.model_dump(
+                    include=PROMPT_VIEW_FIELDS, exclude_none=True
+                )
+        return {key: value for key, value in view.items() if value is not None}
+
+    def restore_hidden_fields(self, previous: "Leg") -> "Leg":
+        """Copy of this leg with the fields `prompt_view` leaves out filled in
+        from `previous`, wherever it still has the same city or airport."""
+        leg = self.model_copy(deep=True)
+        for end in ("departure", "arrival"):
+            location, known = getattr(leg, end), getattr(previous, end)
+            if location is None or known is None:
+                continue
+            for part, identity in IDENTITY_FIELDS.items():
+                current, before = getattr(location, part), getattr(known, part)
+                if not any(
+                    getattr(current, field) is not None
+                    and getattr(current, field) == getattr(before, field)
+                    for field in identity
+                ):
+                    continue
+                for field in (
+                    type(current).model_fields.keys() - PROMPT_VIEW_FIELDS[part]
+                ):
+                    if getattr(current, field) is None:
+                        setattr(current, field, getattr(before, field))
+        return leg
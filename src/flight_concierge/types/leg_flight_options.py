@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+from .flight_option import RankedFlightOption
+
+
+class LegFlightOptions(BaseModel):
+    leg: int
+    departure_city: str | None = None
+    arrival_city: str | None = None
+    date: str | None = None
+    options: list[RankedFlightOption] = []
+    errors: list[str] = []
@@ -6,3 +6,7 @@ from pydantic import BaseModel
 class Message(BaseModel):
     role: Literal["user", "assistant", "system", "tool"] = "assistant"
     content: str = ""
+
+    def estimated_tokens(self) -> int:
+        """Rough token count (about four characters per token, plus framing)."""
+        return len(self.content) // 4 + 4
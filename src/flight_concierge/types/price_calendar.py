@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+
+
+class PriceCalendar(BaseModel):
+    departure_id: str
+    arrival_id: str
+    currency: str
+    outbound_dates: list[str]
+    return_dates: list[str] = Field(
+        default_factory=list, description="Empty for one-way searches"
+    )
+    prices: list[list[float | None]] = Field(
+        description="Cheapest price per outbound date (rows) x return date (columns); "
+        "null where no flight was found or the return precedes the outbound"
+    )
+
+    def cheapest(self) -> dict | None:
+        cells = [
+            (price, row, column)
+            for row, prices in enumerate(self.prices)
+            for column, price in enumerate(prices)
+            if price is not None
+        ]
+        if not cells:
+            return None
+        price, row, column = min(cells)
+        return {
+            "outbound_date": self.outbound_dates[row],
+            "return_date": self.return_dates[column] if self.return_dates else None,
+            "price": price,
+        }
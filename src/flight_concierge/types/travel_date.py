@@ -0,0 +1,27 @@
+from datetime import date
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class TravelDate(BaseModel):
+    date: str | None = Field(
+        None, description="The date in ISO format (YYYY-MM-DD), if the user gave one"
+    )
+
+    @staticmethod
+    def parse_date(v):
+        """Validate and ensure date is in ISO format string."""
+        if v is None:
+            return v
+        if isinstance(v, date):
+            return v.isoformat()
+        if isinstance(v, str):
+            try:
+                date.fromisoformat(v)
+                return v
+            except ValueError:
+                raise ValueError(f"Invalid date format: {v}. Expected YYYY-MM-DD")
+        raise ValueError(f"Date must be a string or date object, got {type(v)}")
+
+    # Shared with DepartureData and ArrivalData
+    validate_date = field_validator("date", mode="before")(parse_date)
@@ -9,3 +9,28 @@ from .review import Review
 class TripData(BaseModel):
     legs: List[Leg] = Field(default_factory=lambda: [Leg()])
     reviews: List[Review] = []
+
+    def prompt_view(self) -> dict:
+        """Compact view for prompts: the essential fields of every leg and only
+        the latest review's feedback, so it stays the same size however many
+        review rounds happened."""
+        view: dict = {"legs": [leg.prompt_view() for leg in self.legs]}
+        if self.reviews:
+            latest = self.reviews[-1]
+            view["latest_review"] = {
+                "human_feedback": latest.human_feedback,
+                "outcome": latest.outcome,
+            }
+        return view
+
+    def restore_hidden_fields(self, previous: "TripData") -> "TripData":
+        """Merge TripData the model regenerated from `prompt_view` over
+        `previous`: legs get back the fields the view leaves out (matched by
+        position) and the full review history is kept."""
+        legs = [
+            leg.restore_hidden_fields(previous.legs[index])
+            if index < len(previous.legs)
+            else leg
+            for index, leg in enumerate(self.legs)
+        ]
+        return self.model_copy(update={"legs": legs, "reviews": previous.reviews})
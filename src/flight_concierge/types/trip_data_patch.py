@@ -0,0 +1,100 @@
+import json
+import re
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from .message import Message
+from .trip_data import TripData
+
+_PATH_TOKEN = re.compile(r"([A-Za-z_]\w*)|\[(\d+)\]")
+
+
+class TripDataChange(BaseModel):
+    op: Literal["set", "append", "remove"] = Field(
+        "set",
+        description="'set' a field, 'append' a leg to 'legs', or 'remove' a leg such as 'legs[1]'",
+    )
+    path: str = Field(
+        description="Path of the field inside the trip data, e.g. 'legs[1].departure.date' "
+        "or 'legs[0].arrival.airport'"
+    )
+    value_json: str = Field(
+        "null",
+        description="The new value encoded as JSON, e.g. '\"2025-02-11\"' or a full airport "
+        "object. Unused for 'remove'",
+    )
+
+
+class TripDataPatch(BaseModel):
+    changes: list[TripDataChange] = Field(
+        default_factory=list,
+        description="Only the changes to the trip data; empty when nothing changes",
+    )
+
+    def apply_to(self, trip_data: TripData) -> TripData:
+        """Apply every change to a copy of `trip_data` and validate the result.
+
+        Raises ValueError (or pydantic's ValidationError) if a path does not
+        address the legs or the patched data is not valid `TripData`.
+        """
+        data = trip_data.model_dump()
+        for change in self.changes:
+            tokens = [
+                name if name else int(index)
+                for name, index in _PATH_TOKEN.findall(change.path)
+            ]
+            if not tokens or tokens[0] != "legs":
+                raise ValueError(f"Only legs can be patched, got {change.path!r}")
+
+            parent = data
+            for token in tokens[:-1]:
+                parent = self._child(parent, token, change.path)
+            last = tokens[-1]
+            if not isinstance(parent, dict | list):
+                raise ValueError(
+                    f"Path {change.path!r} goes through a value that has no fields"
+                )
+
+            if change.op == "remove":
+                if not isinstance(parent, list) or not isinstance(last, int):
+                    raise ValueError(f"Only list items can be removed: {change.path!r}")
+                self._child(parent, last, change.path)
+                del parent[last]
+                continue
+
+            value = json.loads(change.value_json)
+            if change.op == "append":
+                target = self._child(parent, last, change.path)
+                if not isinstance(target, list):
+                    raise ValueError(f"Can only append to a list: {change.path!r}")
+                target.append(value)
+            else:
+                # Every field is in the dump: a missing key is a misspelled path
+                if isinstance(parent, dict) and last not in parent:
+                    raise ValueError(f"Path {change.path!r} does not exist")
+                if isinstance(parent, list):
+                    self._child(parent, last, change.path)
+                parent[last] = value
+
+        return TripData.model_validate(data)
+
+    @staticmethod
+    def _child(parent, token: str | int, path: str):
+        # Fields only exist on objects and indexes on lists: never index a str
+        if not isinstance(parent, list if isinstance(token, int) else dict):
+            raise ValueError(f"Path {path!r} does not exist")
+        try:
+            child = parent[token]
+        except (KeyError, IndexError):
+            raise ValueError(f"Path {path!r} does not exist") from None
+        if child is None:
+            raise ValueError(
+                f"Path {path!r} goes through an empty field; set the whole object"
+            )
+        return child
+
+
+class TripDataUpdate(BaseModel):
+    assistant_response: Message
+    patch: TripDataPatch = Field(default_factory=TripDataPatch)
@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+
+from .leg import Leg
+
+
+class TripLegs(BaseModel):
+    legs: list[Leg] = Field(
+        description="The outbound leg, followed by the return leg for round trips"
+    )
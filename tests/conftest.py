@@ -0,0 +1,229 @@
+import json
+
+import pytest
+
+from flight_concierge.services import FlightSearchCache, LLMResponseCache
+from flight_concierge.stores import (
+    AirportsStore,
+    CitiesStore,
+    CityAirportsStore,
+    CompiledReference,
+    CountriesStore,
+    JsonDataStore,
+    build_city_airports,
+)
+
+COUNTRIES = [
+    {"name": "Brazil", "code": "BR", "currency": "BRL", "population": 211000000},
+    {"name": "Portugal", "code": "PT", "currency": "EUR", "population": 10300000},
+    {"name": "Cape Verde", "code": "CV", "currency": "CVE", "population": 550000},
+    {"name": "United States", "code": "US", "currency": "USD", "population": 331000000},
+]
+
+CITIES = [
+    {
+        "name": "São Paulo",
+        "city_code": "SAO",
+        "lat": -23.55,
+        "lng": -46.63,
+        "country_code": "BR",
+        "population": 12300000,
+    },
+    {
+        "name": "Recife",
+        "city_code": "REC",
+        "lat": -8.05,
+        "lng": -34.88,
+        "country_code": "BR",
+        "population": 1650000,
+    },
+    {
+        "name": "Campinas",
+        "city_code": "CPQ",
+        "lat": -22.91,
+        "lng": -47.06,
+        "country_code": "BR",
+        "population": 1200000,
+    },
+    {
+        "name": "Lisboa",
+        "city_code": "LIS",
+        "lat": 38.72,
+        "lng": -9.14,
+        "country_code": "PT",
+        "population": 545000,
+    },
+    {
+        "name": "Maio",
+        "city_code": "MMO",
+        "lat": 15.16,
+        "lng": -23.21,
+        "country_code": "CV",
+        "population": 7000,
+    },
+    {
+        "name": "Springfield",
+        "city_code": "SGF",
+        "lat": 37.21,
+        "lng": -93.29,
+        "country_code": "US",
+        "population": 169000,
+    },
+    {
+        "name": "Springfield",
+        "city_code": "SPI",
+        "lat": 39.78,
+        "lng": -89.65,
+        "country_code": "US",
+        "population": 114000,
+    },
+    {
+        "name": "Concord",
+        "city_code": "USA",
+        "lat": 35.41,
+        "lng": -80.58,
+        "country_code": "US",
+        "population": 105000,
+    },
+]
+
+AIRPORTS = [
+    {
+        "name": "Guarulhos International Airport",
+        "iata_code": "GRU",
+        "icao_code": "SBGR",
+        "city_code": "SAO",
+        "lat": -23.43,
+        "lng": -46.47,
+        "country_code": "BR",
+        "popularity": 100,
+    },
+    {
+        "name": "Congonhas Airport",
+        "iata_code": "CGH",
+        "icao_code": "SBSP",
+        "city_code": "SAO",
+        "lat": -23.63,
+        "lng": -46.66,
+        "country_code": "BR",
+        "popularity": 90,
+    },
+    {
+        "name": "Heliponto Paulista",
+        "iata_code": "HPX",
+        "city_code": "SAO",
+        "lat": -23.56,
+        "lng": -46.64,
+        "country_code": "BR",
+        "popularity": 50,
+    },
+    {
+        "name": "Recife Guararapes International Airport",
+        "iata_code": "REC",
+        "icao_code": "SBRF",
+        "city_code": "REC",
+        "lat": -8.13,
+        "lng": -34.92,
+        "country_code": "BR",
+        "popularity": 80,
+    },
+    {
+        "name": "Viracopos International Airport",
+        "iata_code": "VCP",
+        "icao_code": "SBKP",
+        "city_code": "CPQ",
+        "lat": -23.01,
+        "lng": -47.13,
+        "country_code": "BR",
+        "popularity": 70,
+    },
+    {
+        "name": "Humberto Delgado Airport",
+        "iata_code": "LIS",
+        "icao_code": "LPPT",
+        "city_code": "LIS",
+        "lat": 38.77,
+        "lng": -9.13,
+        "country_code": "PT",
+        "popularity": 95,
+    },
+    {
+        "name": "Maio Airport",
+        "iata_code": "MMO",
+        "icao_code": "GVMA",
+        "city_code": "MMO",
+        "lat": 15.16,
+        "lng": -23.21,
+        "country_code": "CV",
+        "popularity": 5,
+    },
+    {
+        "name": "Springfield-Branson National Airport",
+        "iata_code": "SGF",
+        "city_code": "SGF",
+        "lat": 37.25,
+        "lng": -93.39,
+        "country_code": "US",
+        "popularity": 20,
+    },
+    {
+        "name": "Abraham Lincoln Capital Airport",
+        "iata_code": "SPI",
+        "city_code": "SPI",
+        "lat": 39.84,
+        "lng": -89.68,
+        "country_code": "US",
+        "popularity": 15,
+    },
+    {
+        "name": "Concord-Padgett Regional Airport",
+        "iata_code": "USA",
+        "city_code": "USA",
+        "lat": 35.39,
+        "lng": -80.71,
+        "country_code": "US",
+        "popularity": 3,
+    },
+]
+
+
+def write_json(path, rows):
+    path.write_text(json.dumps(rows))
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep every process-wide cache and store of a test in its own folder."""
+    monkeypatch.delenv("COMPILE_REFERENCE_DB", raising=False)
+    monkeypatch.setattr(JsonDataStore, "_instances", {})
+    monkeypatch.setattr(CompiledReference, "_instances", {})
+    monkeypatch.setattr(
+        FlightSearchCache,
+        "_instance",
+        FlightSearchCache(path=tmp_path / "flight_search_cache.sqlite"),
+    )
+    monkeypatch.setattr(
+        LLMResponseCache,
+        "_instance",
+        LLMResponseCache(path=tmp_path / "llm_response_cache.sqlite"),
+    )
+
+
+@pytest.fixture
+def db_folder(tmp_path):
+    """A reference database cached in `tmp_path`, served by the shared stores."""
+    folder = tmp_path / "db"
+    folder.mkdir()
+    write_json(folder / "countries.json", COUNTRIES)
+    write_json(folder / "cities.json", CITIES)
+    write_json(folder / "airports.json", AIRPORTS)
+
+    for store_class in (CountriesStore, CitiesStore, AirportsStore, CityAirportsStore):
+        JsonDataStore._instances[store_class] = store_class(
+            folder / store_class.file_name
+        )
+    write_json(
+        folder / "city_airports.json",
+        build_city_airports(CITIES, AirportsStore.shared()),
+    )
+    return folder
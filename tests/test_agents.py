@@ -0,0 +1,132 @@
+import asyncio
+import threading
+
+import pytest
+
+from flight_concierge.agents import (
+    AsyncFlightConciergeAgent,
+    FlightConciergeAgent,
+    model_tier,
+)
+from flight_concierge.services import LLMResponseCache
+from flight_concierge.types import Message, TravelDate
+
+MESSAGES = [Message(role="user", content="I fly to Lisbon on May 10th")]
+
+
+class FakeLLM:
+    model = "fake-model"
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+
+    def call(self, prompt, response_model):
+        self.prompts.append(prompt)
+        return self.answer
+
+    async def acall(self, prompt, response_model):
+        return self.call(prompt, response_model)
+
+
+@pytest.fixture
+def concierge(tmp_path, monkeypatch):
+    monkeypatch.setattr(FlightConciergeAgent, "_instance", None)
+    concierge = FlightConciergeAgent(
+        response_cache=LLMResponseCache(path=tmp_path / "llm.sqlite")
+    )
+    concierge._llms["fast"] = FakeLLM('{"date": "2026-05-10"}')
+    return concierge
+
+
+def test_extraction_answers_are_served_from_the_cache(concierge):
+    first = concierge.extract_travel_date(MESSAGES, "departure")
+    second = concierge.extract_travel_date(MESSAGES, "departure")
+
+    assert first == second == TravelDate(date="2026-05-10")
+    assert len(concierge._llms["fast"].prompts) == 1
+    assert concierge.response_cache.stats["hits"] == 1
+
+    concierge.extract_travel_date(MESSAGES, "arrival")
+    assert len(concierge._llms["fast"].prompts) == 2
+
+
+def test_conversational_answers_are_never_cached(concierge):
+    concierge._llms["fast"] = FakeLLM('{"summary": "Going to Lisbon"}')
+
+    concierge.summarize_conversation("", MESSAGES)
+    concierge.summarize_conversation("", MESSAGES)
+
+    assert len(concierge._llms["fast"].prompts) == 2
+
+
+def test_async_concierge_shares_the_cache(concierge):
+    async_concierge = AsyncFlightConciergeAgent(response_cache=concierge.response_cache)
+    async_concierge._llms["fast"] = FakeLLM('{"date": "2026-05-11"}')
+    concierge.extract_travel_date(MESSAGES, "departure")
+
+    result = asyncio.run(async_concierge.extract_travel_date(MESSAGES, "departure"))
+
+    assert result == TravelDate(date="2026-05-10")
+    assert async_concierge._llms["fast"].prompts == []
+
+
+def test_shared_concierge_is_built_once_and_pools_its_agents(monkeypatch):
+    monkeypatch.setattr(FlightConciergeAgent, "_instance", None)
+    monkeypatch.setattr(AsyncFlightConciergeAgent, "_instance", None)
+    concierge = FlightConciergeAgent.shared()
+
+    assert FlightConciergeAgent.shared() is concierge
+    assert isinstance(AsyncFlightConciergeAgent.shared(), AsyncFlightConciergeAgent)
+
+    with concierge._checkout("fast") as first:
+        with concierge._checkout("fast") as second:
+            assert first is not second
+    with concierge._checkout("fast") as reused:
+        assert reused in (first, second)
+    assert first.llm is not concierge._new_agent("smart").llm
+
+
+def test_async_concierge_reads_and_writes_the_cache_off_the_event_loop(concierge):
+    async_concierge = AsyncFlightConciergeAgent(response_cache=concierge.response_cache)
+    async_concierge._llms["fast"] = FakeLLM('{"date": "2026-05-11"}')
+    cache_threads = []
+    for name in ("get", "put"):
+        method = getattr(concierge.response_cache, name)
+
+        def record(*args, method=method):
+            cache_threads.append(threading.current_thread())
+            return method(*args)
+
+        setattr(concierge.response_cache, name, record)
+
+    async def extract_twice():
+        loop_thread = threading.current_thread()
+        await async_concierge.extract_travel_date(MESSAGES, "departure")
+        await async_concierge.extract_travel_date(MESSAGES, "departure")
+        return loop_thread
+
+    loop_thread = asyncio.run(extract_twice())
+
+    assert len(cache_threads) == 3
+    assert loop_thread not in cache_threads
+    assert len(async_concierge._llms["fast"].prompts) == 1
+
+
+def test_review_outcomes_are_classified_by_the_configured_fast_llm():
+    from crewai.llms.base_llm import BaseLLM
+
+    from flight_concierge.main import FlightConciergeFlow
+
+    configs = [
+        getattr(method, "__human_feedback_config__", None)
+        for method in vars(FlightConciergeFlow).values()
+    ]
+    llms = [config.llm for config in configs if config is not None]
+
+    assert llms
+    fast = model_tier("fast")
+    assert all(isinstance(llm, BaseLLM) for llm in llms)
+    assert {(llm.model, llm.timeout) for llm in llms} == {
+        (fast.model, fast.timeout_seconds)
+    }
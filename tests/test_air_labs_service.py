@@ -0,0 +1,151 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from flight_concierge.services import AirLabsService, air_labs_service
+from flight_concierge.stores import CountriesStore
+
+from .conftest import COUNTRIES
+
+
+@pytest.fixture
+def service(db_folder, monkeypatch):
+    service = AirLabsService(db_folder=db_folder)
+    upstream = {"countries": COUNTRIES}
+    calls = []
+
+    def iter_upstream_rows(name):
+        calls.append(name)
+        time.sleep(0.05)
+        yield from upstream[name]
+
+    monkeypatch.setattr(service, "_iter_upstream_rows", iter_upstream_rows)
+    service.upstream = upstream
+    service.calls = calls
+    return service
+
+
+def _age_metadata(db_folder, name, hours):
+    fetched_at = datetime.now(timezone.utc) - timedelta(hours=hours)
+    (db_folder / f"{name}.meta.json").write_text(
+        json.dumps({"fetched_at": fetched_at.isoformat(), "rows": 0})
+    )
+
+
+def test_concurrent_warm_ups_fetch_a_dataset_once(service, db_folder):
+    (db_folder / "countries.json").unlink()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for future in [
+            executor.submit(service.ensure_countries_cached) for _ in range(4)
+        ]:
+            future.result()
+
+    assert service.calls == ["countries"]
+    assert json.loads((db_folder / "countries.json").read_text()) == COUNTRIES
+    metadata = json.loads((db_folder / "countries.meta.json").read_text())
+    assert metadata["rows"] == len(COUNTRIES)
+    assert metadata["fetch_seconds"] >= 0.05
+    assert list(db_folder.glob("*.tmp")) == []
+
+
+def test_failed_fetch_leaves_no_partial_file(service, db_folder, monkeypatch):
+    (db_folder / "countries.json").unlink()
+
+    def broken_upstream(name):
+        yield COUNTRIES[0]
+        raise ConnectionError("connection reset")
+
+    monkeypatch.setattr(service, "_iter_upstream_rows", broken_upstream)
+
+    with pytest.raises(ConnectionError):
+        service.ensure_countries_cached()
+    assert not (db_folder / "countries.json").exists()
+    assert list(db_folder.glob("*.tmp")) == []
+
+
+def test_fresh_datasets_are_not_refreshed(service, db_folder):
+    _age_metadata(db_folder, "countries", hours=1)
+
+    assert not service._is_expired("countries")
+    assert service._refresh_dataset("countries") is False
+    assert service.calls == []
+
+
+def test_expired_unchanged_dataset_only_renews_its_metadata(service, db_folder):
+    _age_metadata(db_folder, "countries", hours=24 * 30)
+
+    assert service._refresh_dataset("countries") is False
+    assert service.calls == ["countries"]
+    assert not service._is_expired("countries")
+
+
+def test_expired_changed_dataset_is_swapped_in(service, db_folder):
+    _age_metadata(db_folder, "countries", hours=24 * 30)
+    assert CountriesStore.shared().find_by_code("code", "CL") == []
+    service.upstream["countries"] = [*COUNTRIES[1:], {"name": "Chile", "code": "CL"}]
+
+    assert service._refresh_dataset("countries") is True
+    assert CountriesStore.shared().find_by_code("code", "CL")[0]["name"] == "Chile"
+    assert CountriesStore.shared().find_by_code("code", "BR") == []
+
+
+def test_a_failed_refresh_keeps_the_cached_copy(service, db_folder, monkeypatch):
+    for name in ("countries", "cities", "airports"):
+        _age_metadata(db_folder, name, hours=24 * 30)
+
+    def unreachable_upstream(name):
+        raise ConnectionError("AirLabs is down")
+        yield
+
+    monkeypatch.setattr(service, "_iter_upstream_rows", unreachable_upstream)
+
+    service._refresh_stale()
+
+    assert json.loads((db_folder / "countries.json").read_text()) == COUNTRIES
+    assert service._is_expired("countries")
+
+
+def test_background_refresh_runs_once_and_rebuilds_derived_tables(
+    service, db_folder, monkeypatch
+):
+    for name in ("countries", "cities", "airports"):
+        _age_metadata(db_folder, name, hours=1)
+    _age_metadata(db_folder, "countries", hours=24 * 30)
+    service.upstream["countries"] = COUNTRIES[:1]
+    rebuilt = threading.Event()
+    monkeypatch.setattr(service, "ensure_city_airports_cached", rebuilt.set)
+
+    service.refresh_stale_in_background()
+    service.refresh_stale_in_background()
+    AirLabsService._refresh_thread.join(timeout=5)
+
+    assert service.calls == ["countries"]
+    assert rebuilt.is_set()
+
+
+def test_streaming_download_parses_rows_as_they_arrive(db_folder, monkeypatch):
+    monkeypatch.setenv("AIRLABS_STREAMING", "true")
+    body = json.dumps({"request": {}, "response": COUNTRIES}).encode()
+
+    class Response:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        def iter_content(self, chunk_size):
+            return (body[i : i + 7] for i in range(0, len(body), 7))
+
+    monkeypatch.setattr(air_labs_service.requests, "get", lambda *a, **k: Response())
+    service = AirLabsService(db_folder=db_folder)
+
+    assert list(service._iter_upstream_rows("countries")) == COUNTRIES
@@ -0,0 +1,100 @@
+import os
+
+import pytest
+
+from flight_concierge.stores import (
+    AirportsStore,
+    CitiesStore,
+    CityAirportsStore,
+    CompiledReference,
+    CountriesStore,
+    build_city_airports,
+    compile_reference_database,
+)
+
+from .conftest import AIRPORTS, CITIES, write_json
+
+
+def _compile(db_folder):
+    return compile_reference_database(
+        db_folder,
+        [
+            CountriesStore.shared(),
+            CitiesStore.shared(),
+            AirportsStore.shared(),
+            CityAirportsStore.shared(),
+        ],
+    )
+
+
+def _shift_mtime(path, seconds):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+@pytest.fixture
+def compiled(db_folder, monkeypatch):
+    monkeypatch.setenv("COMPILE_REFERENCE_DB", "true")
+    _compile(db_folder)
+    return CompiledReference.shared(db_folder / "reference.sqlite")
+
+
+def test_compiled_lookups_match_the_json_ones(db_folder, monkeypatch):
+    airports, cities = AirportsStore.shared(), CitiesStore.shared()
+    queries = [("city_code", "SAO"), ("iata_code", "gru"), ("icao_code", "XXXX")]
+    expected_codes = [airports.find_by_code(field, code) for field, code in queries]
+    expected_names = cities.search_by_name("s", limit=4)
+    expected_nearby = airports.nearby(-23.55, -46.63, 30)
+
+    monkeypatch.setenv("COMPILE_REFERENCE_DB", "true")
+    _compile(db_folder)
+
+    assert airports._compiled() is not None
+    assert [
+        airports.find_by_code(field, code) for field, code in queries
+    ] == expected_codes
+    assert cities.search_by_name("s", limit=4) == expected_names
+    assert airports.nearby(-23.55, -46.63, 30) == pytest.approx(expected_nearby)
+
+
+def test_compiled_stores_never_read_the_json_files(db_folder, compiled):
+    (db_folder / "cities.json").unlink()
+
+    assert CitiesStore.shared().find_by_code("city_code", "LIS")[0]["name"] == "Lisboa"
+    assert CitiesStore.shared().search_by_name("recife")[0]["city_code"] == "REC"
+
+
+def test_build_city_airports_ignores_a_stale_compiled_snapshot(db_folder, compiled):
+    _shift_mtime(db_folder / "reference.sqlite", -5)
+    write_json(
+        db_folder / "airports.json",
+        [
+            *AIRPORTS,
+            {
+                "name": "Campo de Marte Airport",
+                "iata_code": "RTE",
+                "lat": -23.51,
+                "lng": -46.64,
+                "popularity": 10,
+            },
+        ],
+    )
+
+    sao = build_city_airports(CITIES[:1], AirportsStore.shared())[0]
+
+    assert [airport["iata_code"] for airport in sao["airports"]] == [
+        "GRU",
+        "CGH",
+        "RTE",
+    ]
+
+
+def test_a_compiled_file_is_ignored_once_compilation_is_disabled(
+    db_folder, compiled, monkeypatch
+):
+    monkeypatch.setenv("COMPILE_REFERENCE_DB", "false")
+    write_json(db_folder / "cities.json", CITIES[:1])
+
+    assert not compiled.is_usable()
+    assert CitiesStore.shared()._compiled() is None
+    assert CitiesStore.shared().find_by_code("city_code", "LIS") == []
@@ -0,0 +1,133 @@
+import threading
+
+import pytest
+
+from flight_concierge.services import FlightPrefetcher, FlightSearchError
+from flight_concierge.types import (
+    Airport,
+    ArrivalData,
+    City,
+    Country,
+    DepartureData,
+    Leg,
+    TripData,
+)
+
+
+def _trip(arrival_code="LIS", date="2026-05-10"):
+    return TripData(
+        legs=[
+            Leg(
+                departure=DepartureData(
+                    country=Country(code="BR"),
+                    city=City(
+                        name="São Paulo", city_code="SAO", lat=-23.55, lng=-46.63
+                    ),
+                    airport=Airport(iata_code="GRU", lat=-23.43, lng=-46.47),
+                    date=date,
+                ),
+                arrival=ArrivalData(
+                    country=Country(code="PT"),
+                    city=City(
+                        name="Lisboa", city_code=arrival_code, lat=38.7, lng=-9.1
+                    ),
+                    airport=Airport(iata_code=arrival_code, lat=38.77, lng=-9.13),
+                    date=date,
+                ),
+            )
+        ]
+    )
+
+
+class FakeOrchestrator:
+    def __init__(self, error=None):
+        self.error = error
+        self.searched = []
+        self.release = threading.Event()
+
+    def search(self, trip_data):
+        self.release.wait(5)
+        self.searched.append(trip_data)
+        if self.error is not None:
+            raise self.error
+        return [f"options for {trip_data.legs[0].arrival.airport.iata_code}"]
+
+
+def test_fingerprint_follows_what_the_search_depends_on():
+    trip = _trip()
+    reviewed = trip.model_copy(deep=True)
+    reviewed.reviews = []
+    reviewed.legs[0].arrival.city.lat = 0
+
+    assert FlightPrefetcher.fingerprint(trip) == FlightPrefetcher.fingerprint(reviewed)
+    assert FlightPrefetcher.fingerprint(trip) != FlightPrefetcher.fingerprint(
+        _trip(date="2026-05-11")
+    )
+    assert FlightPrefetcher.fingerprint(trip) != FlightPrefetcher.fingerprint(
+        _trip(arrival_code="OPO")
+    )
+
+
+def test_incomplete_trips_are_not_prefetched():
+    orchestrator = FakeOrchestrator()
+    prefetcher = FlightPrefetcher(orchestrator)
+
+    prefetcher.prefetch(TripData())
+
+    assert FlightPrefetcher.is_ready(_trip())
+    assert not FlightPrefetcher.is_ready(TripData())
+    assert prefetcher.take(_trip()) is None
+
+
+def test_take_hands_over_the_matching_prefetch_once():
+    orchestrator = FakeOrchestrator()
+    prefetcher = FlightPrefetcher(orchestrator)
+
+    prefetcher.prefetch(_trip())
+    prefetcher.prefetch(_trip())
+    orchestrator.release.set()
+
+    assert prefetcher.take(_trip()) == ["options for LIS"]
+    assert len(orchestrator.searched) == 1
+    assert prefetcher.take(_trip()) is None
+
+
+def test_take_discards_a_prefetch_of_a_changed_trip():
+    orchestrator = FakeOrchestrator()
+    prefetcher = FlightPrefetcher(orchestrator)
+
+    prefetcher.prefetch(_trip())
+    orchestrator.release.set()
+
+    assert prefetcher.take(_trip(arrival_code="OPO")) is None
+
+
+def test_prefetchers_share_one_pool():
+    first, second = (
+        FlightPrefetcher(FakeOrchestrator()),
+        FlightPrefetcher(FakeOrchestrator()),
+    )
+
+    assert first._executor is second._executor
+
+
+def test_a_failed_prefetch_falls_back_to_searching_again():
+    orchestrator = FakeOrchestrator(error=FlightSearchError("quota exceeded"))
+    prefetcher = FlightPrefetcher(orchestrator)
+    orchestrator.release.set()
+
+    prefetcher.prefetch(_trip())
+
+    assert prefetcher.take(_trip()) is None
+    assert len(orchestrator.searched) == 1
+
+
+def test_unexpected_prefetch_errors_are_not_swallowed():
+    orchestrator = FakeOrchestrator(error=AttributeError("bug"))
+    prefetcher = FlightPrefetcher(orchestrator)
+    orchestrator.release.set()
+
+    prefetcher.prefetch(_trip())
+
+    with pytest.raises(AttributeError):
+        prefetcher.take(_trip())
@@ -0,0 +1,282 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from flight_concierge.services import (
+    FlightRanker,
+    FlightRankingWeights,
+    FlightSearchCache,
+    FlightSearchError,
+    FlightSearchOrchestrator,
+    GoogleFlightsService,
+    google_flights_service,
+)
+from flight_concierge.services.flight_search_orchestrator import DEFAULT_MAX_WORKERS
+from flight_concierge.types import (
+    Airport,
+    ArrivalData,
+    City,
+    Country,
+    DepartureData,
+    FlightOption,
+    FlightSegment,
+    Leg,
+    TripData,
+)
+
+SERPAPI_OPTION = {
+    "price": 512,
+    "total_duration": 620,
+    "flights": [
+        {
+            "airline": "LATAM",
+            "flight_number": "LA 8084",
+            "departure_airport": {"id": "GRU", "time": "2026-05-10 22:05"},
+            "arrival_airport": {"id": "LIS", "time": "2026-05-11 11:40"},
+            "duration": 575,
+        },
+        {
+            "airline": "LATAM",
+            "departure_airport": {"id": "LIS"},
+            "arrival_airport": {"id": "OPO"},
+        },
+    ],
+}
+
+
+def _option(price, duration, stops=0, departure_time=None):
+    segments = [FlightSegment(departure_time=departure_time)] * (stops + 1)
+    return FlightOption(
+        price=price, total_duration=duration, stops=stops, segments=segments
+    )
+
+
+def _location(data_class, city_code, iata_code, country_code="BR"):
+    return data_class(
+        country=Country(code=country_code),
+        city=City(name=city_code, city_code=city_code),
+        airport=Airport(iata_code=iata_code),
+    )
+
+
+class FakeFlightsService:
+    def __init__(self, delay=0.0, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.searches = []
+        self._lock = threading.Lock()
+
+    def search(self, **search):
+        with self._lock:
+            self.searches.append(search)
+        time.sleep(self.delay)
+        route = (search["departure_id"], search["arrival_id"])
+        if route in self.failing:
+            raise FlightSearchError("no flights")
+        day = int(search["outbound_date"][-2:])
+        return [_option(100 + day + len(self.searches) % 2, 600)]
+
+
+def test_flight_option_from_serpapi_keeps_what_travelers_compare():
+    option = FlightOption.from_serpapi(SERPAPI_OPTION)
+
+    assert option.price == 512
+    assert option.stops == 1
+    assert option.carriers == ["LATAM"]
+    assert option.segments[0].departure_time == "2026-05-10 22:05"
+    assert option.segments[1].departure_time is None
+
+
+def test_cache_serves_repeated_searches_with_normalized_keys():
+    cache = FlightSearchCache.shared()
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return {"best_flights": []}
+
+    assert cache.get_or_fetch({"departure_id": "gru ", "x": None}, fetch) == {
+        "best_flights": []
+    }
+    assert cache.get_or_fetch({"departure_id": "GRU"}, fetch) == {"best_flights": []}
+    assert len(fetches) == 1
+    assert cache.stats == {"hits": 1, "misses": 1, "coalesced": 0}
+
+
+def test_cache_never_stores_errors_and_expires(tmp_path):
+    cache = FlightSearchCache(path=tmp_path / "cache.sqlite", ttl_seconds=0.05)
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return {"error": "quota"} if len(fetches) == 1 else {"ok": len(fetches)}
+
+    assert cache.get_or_fetch({"q": 1}, fetch) == {"error": "quota"}
+    assert cache.get_or_fetch({"q": 1}, fetch) == {"ok": 2}
+    assert cache.get_or_fetch({"q": 1}, fetch) == {"ok": 2}
+    time.sleep(0.1)
+    assert cache.get_or_fetch({"q": 1}, fetch) == {"ok": 3}
+
+
+def test_cache_coalesces_concurrent_identical_searches():
+    cache = FlightSearchCache.shared()
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        time.sleep(0.1)
+        return {"best_flights": [1]}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(cache.get_or_fetch, {"q": "same"}, fetch) for _ in range(4)
+        ]
+        results = [future.result() for future in futures]
+
+    assert results == [{"best_flights": [1]}] * 4
+    assert len(fetches) == 1
+
+
+def test_google_flights_service_raises_upstream_errors(monkeypatch):
+    answers = iter([{"best_flights": [SERPAPI_OPTION]}, {"error": "No results"}])
+
+    timeouts = []
+
+    class GoogleSearch:
+        timeout = 60000
+
+        def __init__(self, params):
+            self.params = params
+
+        def get_dict(self):
+            timeouts.append(self.timeout)
+            return next(answers)
+
+    monkeypatch.setattr(google_flights_service, "GoogleSearch", GoogleSearch)
+    service = GoogleFlightsService(timeout_seconds=20)
+
+    options = service.search("GRU", "LIS", "BRL", "one-way", "2026-05-10")
+    assert [option.price for option in options] == [512]
+    assert timeouts == [20]
+    with pytest.raises(FlightSearchError, match="No results"):
+        service.search("GRU", "OPO", "BRL", "one-way", "2026-05-10")
+
+
+def test_ranker_puts_the_pareto_front_first():
+    cheap, fast, dominated = (
+        _option(300, 900, 1),
+        _option(600, 400),
+        _option(700, 950, 2),
+    )
+
+    ranked = FlightRanker().rank([dominated, fast, cheap])
+
+    assert [option.price for option in ranked] == [300, 600, 700]
+    assert [option.pareto_optimal for option in ranked] == [True, True, False]
+    assert len(FlightRanker().rank([dominated, fast, cheap], limit=1)) == 1
+    assert FlightRanker().rank([]) == []
+
+
+def test_ranker_handles_missing_values_and_departure_preference():
+    morning = _option(500, 600, departure_time="2026-05-10 08:00")
+    night = _option(500, 600, departure_time="2026-05-10 23:30")
+    unknown = FlightOption(price=None, total_duration=None)
+    ranker = FlightRanker(FlightRankingWeights(preferred_departure_hour=22))
+
+    ranked = ranker.rank([morning, unknown, night])
+
+    assert [option.segments[0].departure_time for option in (ranked[0], ranked[2])] == [
+        "2026-05-10 23:30",
+        "2026-05-10 08:00",
+    ]
+    # Unknown price and duration score worst, but nothing beats it on every criterion
+    assert ranked[1].price is None
+    assert [option.pareto_optimal for option in ranked] == [True, True, False]
+
+
+def test_orchestrator_searches_every_airport_pair_of_every_leg(db_folder):
+    flights_service = FakeFlightsService(failing={("CGH", "LIS")})
+    trip_data = TripData(
+        legs=[
+            Leg(
+                departure=_location(DepartureData, "SAO", "GRU"),
+                arrival=_location(ArrivalData, "LIS", "LIS", "PT"),
+                date="2026-05-10",
+            ),
+            Leg(
+                departure=_location(DepartureData, "LIS", "LIS", "PT"),
+                arrival=_location(ArrivalData, "REC", "REC"),
+            ),
+        ]
+    )
+
+    legs = FlightSearchOrchestrator(flights_service).search(trip_data, limit_per_leg=1)
+
+    assert sorted(
+        (search["departure_id"], search["arrival_id"])
+        for search in flights_service.searches
+    ) == [("CGH", "LIS"), ("GRU", "LIS")]
+    assert {search["currency"] for search in flights_service.searches} == {"BRL"}
+    assert len(legs[0].options) == 1
+    assert legs[0].errors == ["CGH->LIS: no flights"]
+    assert legs[1].errors == ["Missing departure date"]
+
+
+def test_orchestrator_reports_slow_searches_as_timeouts():
+    orchestrator = FlightSearchOrchestrator(
+        FakeFlightsService(delay=0.5), timeout_seconds=0.05
+    )
+
+    outcomes = orchestrator._search_concurrently(
+        [dict(departure_id="GRU", arrival_id="LIS", outbound_date="2026-05-10")]
+    )
+
+    assert isinstance(outcomes[0], TimeoutError)
+
+
+def test_orchestrator_times_searches_from_when_they_start():
+    # Twice as many searches as workers: the second half queues for 0.2s
+    flights_service = FakeFlightsService(delay=0.2)
+    orchestrator = FlightSearchOrchestrator(flights_service, timeout_seconds=0.3)
+    searches = [
+        dict(departure_id="GRU", arrival_id="LIS", outbound_date="2026-05-10")
+    ] * (2 * DEFAULT_MAX_WORKERS)
+
+    outcomes = orchestrator._search_concurrently(searches)
+
+    assert not any(isinstance(outcome, Exception) for outcome in outcomes)
+
+
+def test_orchestrators_share_one_bounded_pool():
+    first, second = (
+        FlightSearchOrchestrator(FakeFlightsService(delay=0.01)) for _ in range(2)
+    )
+    search = dict(departure_id="GRU", arrival_id="LIS", outbound_date="2026-05-10")
+
+    for orchestrator in (first, second, first):
+        orchestrator._search_concurrently([search] * 20)
+
+    assert first._shared_executor() is second._shared_executor()
+    assert (
+        len([t for t in threading.enumerate() if t.name.startswith("flight-search")])
+        <= DEFAULT_MAX_WORKERS
+    )
+
+
+def test_price_calendar_skips_returns_before_departures():
+    flights_service = FakeFlightsService()
+
+    calendar = FlightSearchOrchestrator(flights_service).search_calendar(
+        "GRU", "LIS", "BRL", "2026-05-10", return_date="2026-05-11", flex_days=1
+    )
+
+    assert calendar.outbound_dates == ["2026-05-09", "2026-05-10", "2026-05-11"]
+    assert calendar.return_dates == ["2026-05-10", "2026-05-11", "2026-05-12"]
+    assert calendar.prices[2][0] is None
+    assert all(price is not None for price in calendar.prices[0])
+    assert len(flights_service.searches) == 8
+    assert {search["trip_type"] for search in flights_service.searches} == {
+        "round-trip"
+    }
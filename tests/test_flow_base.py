@@ -0,0 +1,144 @@
+import pytest
+
+from flight_concierge import flow_base
+from flight_concierge.flow_base import FlightConciergeFlowBase
+from flight_concierge.services import FlightPrefetcher
+from flight_concierge.types import (
+    Airport,
+    City,
+    Country,
+    DepartureData,
+    FlightConciergeState,
+    Interaction,
+    Leg,
+    Message,
+    TripData,
+    TripDataChange,
+    TripDataPatch,
+    TripDataUpdate,
+)
+
+
+class FakeConcierge:
+    @classmethod
+    def shared(cls):
+        return cls()
+
+
+class Flow(FlightConciergeFlowBase):
+    concierge_class = FakeConcierge
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.state = FlightConciergeState(
+            trip_data=TripData(
+                legs=[
+                    Leg(
+                        departure=DepartureData(
+                            country=Country(code="BR"),
+                            city=City(name="São Paulo", city_code="SAO"),
+                            airport=Airport(iata_code="GRU", city_code="SAO"),
+                            date="2026-05-10",
+                        )
+                    )
+                ]
+            )
+        )
+
+
+@pytest.fixture
+def flow(monkeypatch):
+    monkeypatch.setattr(flow_base, "AirLabsService", lambda: None)
+    return Flow()
+
+
+def _reply(content="Done"):
+    return Message(role="assistant", content=content)
+
+
+def test_a_patch_updates_the_trip_data(flow):
+    update = TripDataUpdate(
+        assistant_response=_reply(),
+        patch=TripDataPatch(
+            changes=[
+                TripDataChange(path="legs[0].departure.date", value_json='"2026-05-11"')
+            ]
+        ),
+    )
+
+    result = flow._update_trip_data(update)
+
+    assert flow.state.trip_data.legs[0].departure.date == "2026-05-11"
+    assert result.metadata is flow.state.trip_data
+    assert result.assistant_response == _reply()
+
+
+def test_an_invalid_patch_leaves_the_trip_data_alone(flow):
+    before = flow.state.trip_data.model_copy(deep=True)
+    update = TripDataUpdate(
+        assistant_response=_reply(),
+        patch=TripDataPatch(
+            changes=[TripDataChange(path="legs[0].departure.dat", value_json="1")]
+        ),
+    )
+
+    result = flow._update_trip_data(update)
+
+    assert flow.state.trip_data == before
+    assert result.assistant_response.content == flow_base.PATCH_FAILED_RESPONSE
+
+
+def test_full_trip_data_keeps_the_fields_the_prompt_left_out(flow):
+    regenerated = TripData.model_validate(flow.state.trip_data.prompt_view())
+    regenerated.legs[0].date = "2026-05-12"
+
+    result = flow._update_trip_data(
+        Interaction(assistant_response=_reply(), metadata=regenerated)
+    )
+
+    assert flow.state.trip_data.legs[0].date == "2026-05-12"
+    assert flow.state.trip_data.legs[0].departure.airport.city_code == "SAO"
+    assert result.metadata is flow.state.trip_data
+
+
+def test_a_reply_without_trip_data_keeps_the_current_one(flow):
+    before = flow.state.trip_data
+
+    result = flow._update_trip_data(Interaction(assistant_response=_reply("When?")))
+
+    assert flow.state.trip_data is before
+    assert result.metadata is before
+    assert flow._record_reply(result, keep_interaction=True) == "When?"
+    assert flow.state.interactions == [result]
+
+
+def test_conversation_summary_moves_the_summarized_boundary(flow):
+    flow.state.messages = [Message(role="user", content=str(n)) for n in range(3)]
+
+    flow._apply_conversation_summary(
+        flow.state.messages[:2], flow_base.ConversationSummary(summary="0 then 1")
+    )
+
+    assert flow.state.summarized_count == 2
+    assert [message.content for message in flow.state.context_messages()] == [
+        "Summary of the earlier conversation: 0 then 1",
+        "2",
+    ]
+
+
+def test_flight_options_come_from_a_matching_prefetch(flow, monkeypatch):
+    class Prefetcher(FlightPrefetcher):
+        def take(self, trip_data):
+            return ["prefetched"]
+
+    flow.flight_prefetcher = Prefetcher(orchestrator=object())
+
+    assert flow._find_flight_options() == ["prefetched"]
+
+
+def test_the_location_fast_path_is_opt_in(monkeypatch):
+    monkeypatch.setattr(flow_base, "AirLabsService", lambda: None)
+
+    assert Flow().location_resolver is None
+    monkeypatch.setenv("LOCATION_FAST_PATH", "true")
+    assert Flow().location_resolver is not None
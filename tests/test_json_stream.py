@@ -0,0 +1,82 @@
+import json
+import random
+
+import pytest
+
+from flight_concierge.stores import JsonArrayWriter, iter_json_array, iter_json_file
+
+DOCUMENT = json.dumps(
+    {
+        "request": {"params": [1, 2]},
+        "response": [
+            {"name": 'São Paulo "Guarulhos"', "lat": -23.43, "popularity": 12.5e3},
+            123,
+            -7,
+            0.25,
+            -1.5e-3,
+            "🛫",
+            None,
+            True,
+            [1, [2]],
+        ],
+    },
+    ensure_ascii=False,
+).encode()
+
+
+def _split(data: bytes, cuts: list[int]) -> list[bytes]:
+    bounds = [0, *cuts, len(data)]
+    return [data[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def test_items_survive_any_chunking():
+    expected = json.loads(DOCUMENT)["response"]
+    rng = random.Random(0)
+
+    for _ in range(500):
+        cuts = sorted(rng.sample(range(1, len(DOCUMENT)), rng.randint(0, 12)))
+        assert list(iter_json_array(_split(DOCUMENT, cuts), key="response")) == expected
+
+
+def test_a_number_split_across_chunks_is_not_cut():
+    assert list(iter_json_array(["[1", "23, 4]"])) == [123, 4]
+    assert list(iter_json_array(["[1.", "5e", "2, -", "7]"])) == [150.0, -7]
+    assert list(iter_json_array(["[1", "E3]"])) == [1000.0]
+
+
+def test_top_level_array_and_empty_array():
+    assert list(iter_json_array([b" [ ", b"]"])) == []
+    assert list(iter_json_array(['[{"a": 1}', ', {"a": 2}]'])) == [{"a": 1}, {"a": 2}]
+
+
+def test_missing_array_and_truncated_stream_raise():
+    with pytest.raises(ValueError, match="No JSON array"):
+        list(iter_json_array(['{"request": {}}'], key="response"))
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(['[{"a": 1}, {"a"']))
+
+
+def test_writer_commits_atomically(tmp_path):
+    target = tmp_path / "rows.json"
+    target.write_text("[]")
+
+    with JsonArrayWriter(target) as writer:
+        writer.write({"a": 1})
+        assert json.loads(target.read_text()) == []
+        writer.write({"a": 2})
+        writer.commit()
+
+    assert list(iter_json_file(target)) == [{"a": 1}, {"a": 2}]
+    assert writer.rows == 2
+    assert list(tmp_path.glob("*.tmp")) == []
+
+
+def test_writer_without_commit_leaves_the_target_alone(tmp_path):
+    target = tmp_path / "rows.json"
+    target.write_text('[{"a": 0}]')
+
+    with JsonArrayWriter(target) as writer:
+        writer.write({"a": 1})
+
+    assert json.loads(target.read_text()) == [{"a": 0}]
+    assert list(tmp_path.glob("*.tmp")) == []
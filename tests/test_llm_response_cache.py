@@ -0,0 +1,74 @@
+import time
+
+from flight_concierge.services import (
+    FlightSearchCache,
+    LLMResponseCache,
+    llm_response_cache_enabled,
+)
+
+PARAMS = {"method": "extract_departure_data", "prompt": "from gru", "model": "m"}
+
+
+def test_hits_count_the_time_they_saved(tmp_path):
+    cache = LLMResponseCache(path=tmp_path / "cache.sqlite")
+
+    assert cache.get(PARAMS) is None
+    cache.put(PARAMS, '{"city": "SAO"}', latency_seconds=1.5)
+
+    assert cache.get(PARAMS) == '{"city": "SAO"}'
+    assert cache.get({**PARAMS, "model": "other"}) is None
+    assert cache.stats == {
+        "hits": 1,
+        "misses": 2,
+        "hit_rate": 0.3333,
+        "saved_seconds": 1.5,
+    }
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMResponseCache(path=tmp_path / "cache.sqlite", max_entries=2)
+    first, second, third = ({**PARAMS, "prompt": str(n)} for n in range(3))
+
+    cache.put(first, "1", 0)
+    time.sleep(0.01)
+    cache.put(second, "2", 0)
+    time.sleep(0.01)
+    assert cache.get(first) == "1"
+    time.sleep(0.01)
+    cache.put(third, "3", 0)
+
+    assert cache.get(second) is None
+    assert cache.get(first) == "1"
+    assert cache.get(third) == "3"
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    cache = LLMResponseCache(path=tmp_path / "cache.sqlite", ttl_seconds=0.05)
+
+    cache.put(PARAMS, "answer", 0)
+    time.sleep(0.1)
+
+    assert cache.get(PARAMS) is None
+
+
+def test_entries_survive_across_instances(tmp_path):
+    LLMResponseCache(path=tmp_path / "cache.sqlite").put(PARAMS, "answer", 0)
+
+    assert LLMResponseCache(path=tmp_path / "cache.sqlite").get(PARAMS) == "answer"
+
+
+def test_the_cache_is_opt_in(monkeypatch):
+    monkeypatch.delenv("LLM_RESPONSE_CACHE", raising=False)
+    assert not llm_response_cache_enabled()
+
+    monkeypatch.setenv("LLM_RESPONSE_CACHE", "true")
+    assert llm_response_cache_enabled()
+
+
+def test_each_cache_shares_its_own_instance(tmp_path, monkeypatch):
+    monkeypatch.setattr(LLMResponseCache, "_instance", None)
+    monkeypatch.setattr(LLMResponseCache, "file_name", str(tmp_path / "llm.sqlite"))
+
+    assert LLMResponseCache.shared() is LLMResponseCache.shared()
+    assert LLMResponseCache.shared().path == tmp_path / "llm.sqlite"
+    assert isinstance(FlightSearchCache.shared(), FlightSearchCache)
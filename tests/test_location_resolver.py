@@ -0,0 +1,71 @@
+import pytest
+
+from flight_concierge.services import LocationResolver
+from flight_concierge.types import ArrivalData, DepartureData
+
+
+@pytest.fixture
+def resolver(db_folder):
+    return LocationResolver()
+
+
+def _codes(location):
+    return None if location is None else location.airport.iata_code
+
+
+def test_city_names_after_markers_resolve_to_their_main_airport(resolver):
+    text = "Quero viajar de São Paulo para Lisboa"
+
+    departure = resolver.resolve_departure(text)
+    arrival = resolver.resolve_arrival(text)
+
+    assert isinstance(departure, DepartureData)
+    assert isinstance(arrival, ArrivalData)
+    assert (departure.city.city_code, departure.airport.iata_code) == ("SAO", "GRU")
+    assert (arrival.city.city_code, arrival.airport.iata_code) == ("LIS", "LIS")
+    assert departure.country.name == "Brazil"
+    assert departure.date is None
+
+
+def test_codes_resolve_airports_and_metropolitan_areas(resolver):
+    assert _codes(resolver.resolve_departure("from CGH to LIS")) == "CGH"
+    assert _codes(resolver.resolve_departure("from SAO to LIS")) == "GRU"
+    # A code is explicit enough on its own
+    assert _codes(resolver.resolve_arrival("I need a flight to LIS")) == "LIS"
+
+
+def test_a_city_name_alone_falls_back_to_the_agent(resolver):
+    text = "Quero ir para Lisboa dia 10 de maio"
+
+    assert resolver.resolve_arrival(text) is None
+    # "maio" is the month, not the island of Maio
+    assert resolver.resolve_departure(text) is None
+
+
+def test_months_and_stop_words_after_markers_are_not_places(resolver):
+    text = "Vou para Lisboa no dia 10 de maio, saindo de São Paulo"
+
+    assert _codes(resolver.resolve_departure(text)) == "GRU"
+    assert _codes(resolver.resolve_arrival(text)) == "LIS"
+    assert resolver.resolve_arrival("de Recife a Maio") is None
+    assert resolver.resolve_arrival("from Recife to the Maio island") is None
+
+
+def test_uppercase_words_are_not_taken_for_codes(resolver):
+    assert resolver.resolve_arrival("Flying from Recife to USA next week") is None
+    assert resolver.resolve_departure("Flying from Recife to USA next week") is None
+    assert resolver.resolve_arrival("I NEED TO GO TO LIS") is None
+
+
+def test_ambiguous_or_unknown_places_fall_back_to_the_agent(resolver):
+    # Two Springfields of similar size
+    assert resolver.resolve_departure("from Springfield to Lisboa") is None
+    assert resolver.resolve_departure("from Atlantis to Lisboa") is None
+    # Candidates disagreeing on the city
+    assert resolver.resolve_arrival("to Recife or to Lisboa") is None
+    # Both ends naming the same city
+    assert resolver.resolve_arrival("from Lisboa to Lisboa") is None
+
+
+def test_missing_reference_data_falls_back_to_the_agent(tmp_path):
+    assert LocationResolver().resolve_departure("from SAO to LIS") is None
@@ -0,0 +1,22 @@
+from flight_concierge.agents import model_tier
+
+
+def test_tiers_default_to_their_models_and_budgets(monkeypatch):
+    for name in ("FAST", "SMART"):
+        monkeypatch.delenv(f"CONCIERGE_{name}_MODEL", raising=False)
+        monkeypatch.delenv(f"CONCIERGE_{name}_TIMEOUT_SECONDS", raising=False)
+
+    assert model_tier("fast").model == "gpt-4.1-mini"
+    assert model_tier("fast").timeout_seconds == 15
+    assert model_tier("smart").timeout_seconds == 60
+
+
+def test_tiers_are_read_from_the_environment_when_used(monkeypatch):
+    monkeypatch.setenv("CONCIERGE_FAST_MODEL", "gpt-4.1-nano")
+    monkeypatch.setenv("CONCIERGE_FAST_TIMEOUT_SECONDS", "2.5")
+
+    llm = model_tier("fast").llm()
+
+    assert llm.model == "gpt-4.1-nano"
+    assert llm.timeout == 2.5
+    assert not llm.stream
@@ -0,0 +1,37 @@
+import json
+import random
+
+from flight_concierge.agents.response_streamer import AssistantResponseStream
+
+CONTENT = 'Olá! Voo "direto" às 22h\n\\ partindo de São Paulo 🛫 ✈'
+DOCUMENT = json.dumps(
+    {
+        "assistant_response": {"role": "assistant", "content": CONTENT},
+        "trip_data": {"legs": [{"date": "2026-05-10"}]},
+    },
+    ensure_ascii=True,
+)
+
+
+def test_content_survives_any_chunking():
+    rng = random.Random(0)
+
+    for _ in range(300):
+        cuts = sorted(rng.sample(range(1, len(DOCUMENT)), rng.randint(0, 20)))
+        bounds = [0, *cuts, len(DOCUMENT)]
+        tokens = []
+        stream = AssistantResponseStream(tokens.append)
+        for start, end in zip(bounds, bounds[1:]):
+            stream.feed(DOCUMENT[start:end])
+        assert "".join(tokens) == CONTENT
+        assert all(tokens)
+
+
+def test_text_outside_the_response_content_is_not_streamed():
+    tokens = []
+    stream = AssistantResponseStream(tokens.append)
+
+    stream.feed('{"trip_data": {"content": "no"}, ')
+    stream.feed('"assistant_response": {"content": "yes"}, "other": {"content": "no"}}')
+
+    assert tokens == ["yes"]
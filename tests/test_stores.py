@@ -0,0 +1,132 @@
+import os
+
+import pytest
+
+from flight_concierge.stores import (
+    AirportsStore,
+    CitiesStore,
+    CityAirportsStore,
+    CountriesStore,
+    NameIndex,
+    fold,
+)
+from flight_concierge.stores.geo_grid import GeoGrid, haversine_km
+
+from .conftest import AIRPORTS, write_json
+
+
+def test_find_by_code_is_case_insensitive_and_ranked(db_folder):
+    airports = AirportsStore.shared()
+
+    assert airports.find_by_code("iata_code", "gru")[0]["name"].startswith("Guarulhos")
+    by_city = airports.find_by_code("city_code", "SAO")
+    assert [airport["iata_code"] for airport in by_city] == ["GRU", "CGH", "HPX"]
+    assert len(airports.find_by_code("city_code", "SAO", limit=1)) == 1
+    assert airports.find_by_code("iata_code", "XXX") == []
+
+
+def test_store_reloads_only_when_the_file_changes(db_folder):
+    countries = CountriesStore.shared()
+    assert countries.find_by_code("code", "BR")
+    rows = countries.rows
+    assert countries.rows is rows
+
+    write_json(db_folder / "countries.json", [{"name": "Chile", "code": "CL"}])
+    stat = (db_folder / "countries.json").stat()
+    os.utime(
+        db_folder / "countries.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+    )
+
+    assert countries.find_by_code("code", "BR") == []
+    assert countries.find_by_code("code", "CL")[0]["name"] == "Chile"
+
+
+def test_missing_file_raises_file_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError, match="Please run the service"):
+        CountriesStore(tmp_path / "countries.json").find_by_code("code", "BR")
+
+
+def test_fold_strips_accents_and_case():
+    assert fold("São Paulo") == fold("SAO PAULO") == "sao paulo"
+
+
+def test_name_index_finds_substrings_without_accents():
+    index = NameIndex(["São Paulo", "Paulínia", None, "Recife"])
+
+    assert index.search("paul") == [0, 1]
+    assert index.search("PAULINIA") == [1]
+    assert index.search("o") == [0]
+    assert index.search("xyz") == []
+
+
+def test_search_by_name_ranks_exact_then_prefix_then_rank(db_folder):
+    cities = CitiesStore.shared()
+
+    assert cities.search_by_name("sao paulo")[0]["city_code"] == "SAO"
+    # Both Springfields match exactly: the more populous one comes first
+    assert [city["city_code"] for city in cities.search_by_name("springfield")] == [
+        "SGF",
+        "SPI",
+    ]
+    # Cities starting with the query come before bigger ones merely containing it
+    assert [city["city_code"] for city in cities.search_by_name("s")] == [
+        "SAO",
+        "SGF",
+        "SPI",
+        "CPQ",
+        "LIS",
+    ]
+    assert [city["city_code"] for city in cities.search_by_name("a", limit=2)] == [
+        "SAO",
+        "CPQ",
+    ]
+
+
+def test_project_keeps_only_the_compact_fields(db_folder):
+    airports = AirportsStore.shared()
+    gru = airports.find_by_code("iata_code", "GRU")[0]
+
+    assert airports.project({**gru, "timezone": "America/Sao_Paulo"}) == gru
+
+
+def test_geo_grid_matches_a_brute_force_scan():
+    points = [(airport["lat"], airport["lng"]) for airport in AIRPORTS] + [
+        None,
+        (0.1, 179.9),
+        (0.1, -179.9),
+    ]
+    grid = GeoGrid(points)
+
+    for lat, lng, radius in [(-23.55, -46.63, 30), (0.0, 180.0, 50), (38, -9, 500)]:
+        expected = sorted(
+            (position, haversine_km(lat, lng, *point))
+            for position, point in enumerate(points)
+            if point is not None and haversine_km(lat, lng, *point) <= radius
+        )
+        assert sorted(grid.within(lat, lng, radius)) == pytest.approx(expected)
+
+
+def test_nearby_skips_heliports_and_sorts_by_distance(db_folder):
+    matches = AirportsStore.shared().nearby(-23.55, -46.63, 30)
+
+    assert [airport["iata_code"] for airport, _ in matches] == ["CGH", "GRU"]
+    assert matches[0][1] < matches[1][1]
+    assert AirportsStore.shared().nearby(-23.55, -46.63, 30, limit=1)[0][0][
+        "iata_code"
+    ] == ("CGH")
+
+
+def test_city_airports_join_ranks_by_popularity(db_folder):
+    city_airports = CityAirportsStore.shared()
+
+    assert [airport["iata_code"] for airport in city_airports.airports_for("SAO")] == [
+        "GRU",
+        "CGH",
+    ]
+    assert city_airports.airports_for("XXX") == []
+
+
+def test_city_airports_is_none_before_the_join_is_built(tmp_path):
+    assert (
+        CityAirportsStore(tmp_path / "city_airports.json").airports_for("SAO") is None
+    )
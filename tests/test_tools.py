@@ -0,0 +1,59 @@
+import asyncio
+
+from flight_concierge import tools
+from flight_concierge.stores import AirportsStore
+from flight_concierge.tools import (
+    QueryLocalAirportsDatabase,
+    QueryLocalCitiesDatabase,
+    QueryLocalCountriesDatabase,
+    QueryLocalNearbyAirports,
+)
+from flight_concierge.tools.threaded_tool import ThreadedTool
+
+
+def test_airports_tool_prefers_codes_and_projects_rows(db_folder):
+    tool = QueryLocalAirportsDatabase()
+
+    assert [row["iata_code"] for row in tool._run("gru")] == ["GRU"]
+    assert [row["iata_code"] for row in tool._run("SBSP")] == ["CGH"]
+    assert [row["iata_code"] for row in tool._run("SAO", limit=2)] == ["GRU", "CGH"]
+    assert tool._run("guarulhos")[0]["iata_code"] == "GRU"
+    assert set(tool._run("GRU")[0]) <= set(AirportsStore.compact_fields)
+
+
+def test_cities_tool_attaches_ranked_airports(db_folder):
+    cities = QueryLocalCitiesDatabase()._run("sao paulo")
+
+    assert cities[0]["city_code"] == "SAO"
+    assert [airport["iata_code"] for airport in cities[0]["airports"]] == [
+        "GRU",
+        "CGH",
+    ]
+
+
+def test_countries_tool_searches_codes_then_names(db_folder):
+    tool = QueryLocalCountriesDatabase()
+
+    assert tool._run("pt") == [{"name": "Portugal", "code": "PT"}]
+    assert tool._run("verde", filter_by="name") == [
+        {"name": "Cape Verde", "code": "CV"}
+    ]
+    assert tool._run("XX", filter_by="code") == []
+
+
+def test_nearby_airports_tool_is_bounded_and_nearest_first(db_folder):
+    airports = QueryLocalNearbyAirports()._run(-23.55, -46.63, distance_km=30, limit=1)
+
+    assert len(airports) == 1
+    assert airports[0]["iata_code"] == "CGH"
+    assert airports[0]["distance_km"] < 10
+
+
+def test_tools_run_off_the_event_loop(db_folder):
+    countries = asyncio.run(QueryLocalCountriesDatabase()._arun("BR"))
+
+    assert countries == [{"name": "Brazil", "code": "BR"}]
+
+
+def test_every_tool_runs_off_the_event_loop():
+    assert all(issubclass(getattr(tools, name), ThreadedTool) for name in tools.__all__)
@@ -0,0 +1,188 @@
+from datetime import date
+
+import pytest
+from pydantic import ValidationError
+
+from flight_concierge.types import (
+    Airport,
+    ArrivalData,
+    City,
+    Country,
+    DepartureData,
+    FlightConciergeState,
+    Leg,
+    Message,
+    Review,
+    TravelDate,
+    TripData,
+    TripDataChange,
+    TripDataPatch,
+)
+
+
+def _departure(**airport_fields):
+    return DepartureData(
+        country=Country(name="Brazil", code="BR"),
+        city=City(name="São Paulo", city_code="SAO", lat=-23.55, lng=-46.63),
+        airport=Airport(
+            name="Guarulhos",
+            iata_code="GRU",
+            icao_code="SBGR",
+            lat=-23.43,
+            lng=-46.47,
+            **airport_fields,
+        ),
+        date="2026-05-10",
+    )
+
+
+def _trip(reviews=0):
+    return TripData(
+        legs=[
+            Leg(
+                departure=_departure(city="São Paulo", city_code="SAO"),
+                arrival=ArrivalData(
+                    country=Country(name="Portugal", code="PT"),
+                    city=City(name="Lisboa", city_code="LIS", country_code="PT"),
+                    airport=Airport(name="Humberto Delgado", iata_code="LIS"),
+                ),
+            )
+        ],
+        reviews=[
+            Review(
+                agent_output="plan",
+                human_feedback=f"feedback {n}",
+                outcome="needs_changes",
+            )
+            for n in range(reviews)
+        ],
+    )
+
+
+def _state(*contents, summarized_count=0, summary=""):
+    return FlightConciergeState(
+        messages=[Message(role="user", content=content) for content in contents],
+        summarized_count=summarized_count,
+        conversation_summary=summary,
+    )
+
+
+def test_location_dates_accept_dates_and_reject_other_formats():
+    assert _departure().date == "2026-05-10"
+    assert (
+        ArrivalData(
+            country=Country(), city=City(), airport=Airport(), date=date(2026, 5, 10)
+        ).date
+        == "2026-05-10"
+    )
+    with pytest.raises(ValidationError, match="Expected YYYY-MM-DD"):
+        DepartureData(country=Country(), city=City(), airport=Airport(), date="10/05")
+    with pytest.raises(ValidationError, match="Expected YYYY-MM-DD"):
+        ArrivalData(country=Country(), city=City(), airport=Airport(), date="10/05")
+    assert TravelDate(date=date(2026, 5, 10)).date == "2026-05-10"
+    with pytest.raises(ValidationError, match="must be a string or date"):
+        TravelDate(date=20260510)
+
+
+def test_context_keeps_the_recent_messages_within_the_budget():
+    state = _state("a" * 400, "b" * 400, "c" * 400)
+
+    assert state.messages_to_summarize(budget_tokens=250) == state.messages[:1]
+    assert state.messages_to_summarize(budget_tokens=10_000) == []
+    # The latest message is kept even when it alone exceeds the budget
+    assert state.messages_to_summarize(budget_tokens=1) == state.messages[:2]
+
+
+def test_context_replaces_summarized_messages_with_the_summary():
+    state = _state(
+        "first", "second", "third", summarized_count=2, summary="went to LIS"
+    )
+
+    context = state.context_messages()
+
+    assert [message.role for message in context] == ["system", "user"]
+    assert "went to LIS" in context[0].content
+    assert context[1].content == "third"
+    assert state.messages_to_summarize(budget_tokens=1) == []
+    assert _state("only").context_messages() == _state("only").messages
+
+
+def test_prompt_view_stays_bounded_however_many_reviews():
+    view = _trip(reviews=5).prompt_view()
+
+    assert view["latest_review"] == {
+        "human_feedback": "feedback 4",
+        "outcome": "needs_changes",
+    }
+    assert len(str(view)) == len(str(_trip(reviews=1).prompt_view()))
+    assert "city" not in view["legs"][0]["departure"]["airport"]
+    assert "country_code" not in view["legs"][0]["arrival"]["city"]
+
+
+def test_restore_hidden_fields_keeps_what_the_view_left_out():
+    previous = _trip(reviews=2)
+    regenerated = TripData.model_validate(previous.prompt_view())
+    regenerated.legs[0].date = "2026-05-12"
+
+    restored = regenerated.restore_hidden_fields(previous)
+
+    assert restored.legs[0].date == "2026-05-12"
+    assert restored.legs[0].departure.airport.city_code == "SAO"
+    assert restored.legs[0].arrival.city.country_code == "PT"
+    assert restored.reviews == previous.reviews
+
+
+def test_restore_hidden_fields_drops_them_for_a_different_place():
+    previous = _trip()
+    regenerated = TripData.model_validate(previous.prompt_view())
+    regenerated.legs[0].departure.airport = Airport(iata_code="CGH")
+    regenerated.legs.append(Leg())
+
+    restored = regenerated.restore_hidden_fields(previous)
+
+    assert restored.legs[0].departure.airport.city_code is None
+    assert restored.legs[0].departure.city.lat == -23.55
+    assert restored.legs[1] == Leg()
+
+
+def test_patch_sets_appends_and_removes_legs():
+    patch = TripDataPatch(
+        changes=[
+            TripDataChange(path="legs[0].departure.date", value_json='"2026-05-11"'),
+            TripDataChange(
+                op="append", path="legs", value_json='{"date": "2026-05-20"}'
+            ),
+            TripDataChange(op="append", path="legs", value_json="{}"),
+            TripDataChange(op="remove", path="legs[2]"),
+        ]
+    )
+    trip = _trip()
+
+    patched = patch.apply_to(trip)
+
+    assert patched.legs[0].departure.date == "2026-05-11"
+    assert patched.legs[0].departure.airport.city_code == "SAO"
+    assert [leg.date for leg in patched.legs] == [None, "2026-05-20"]
+    assert trip.legs[0].departure.date == "2026-05-10"
+    assert TripDataPatch().apply_to(trip) == trip
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        TripDataChange(path="reviews[0]", value_json="{}"),
+        TripDataChange(path="legs[3].date", value_json='"2026-05-11"'),
+        TripDataChange(path="legs[0].departure.dat", value_json='"2026-05-11"'),
+        TripDataChange(path="legs[0].departure.date", value_json='"11/05/2026"'),
+        TripDataChange(path="legs[1].departure.date", value_json='"2026-05-11"'),
+        TripDataChange(op="remove", path="legs[0].departure"),
+        TripDataChange(op="append", path="legs[0].date", value_json="{}"),
+        TripDataChange(path="legs[0].departure.country.code.x", value_json="1"),
+        TripDataChange(path="legs[0].departure.country.code[0]", value_json='"C"'),
+        TripDataChange(op="remove", path="legs[0].departure.date[0]"),
+        TripDataChange(path="legs.x", value_json="1"),
+    ],
+)
+def test_patch_rejects_changes_outside_valid_trip_data(change):
+    with pytest.raises(ValueError):
+        TripDataPatch(changes=[change]).apply_to(_trip())